@@ -49,6 +49,7 @@ options(setup=dict(
     data_files=[
         (ReadonlyConfigDir + "schedulers", [
           "sibt/schedulers/anacron",
+          "sibt/schedulers/daemon",
           "sibt/schedulers/simple"]),
 
         (ReadonlyConfigDir + "synchronizers", [
@@ -16,6 +16,8 @@
 
 from sibt.configuration.dirbasedrulesreader import DirBasedRulesReader
 from sibt.configuration.cachinginifilelistreader import CachingIniFileListReader
+from sibt.configuration.diskcachinginifilelistreader import \
+    DiskCachingIniFileListReader
 from sibt.configuration import dirbasedrulesreader
 from sibt.domain.defaultvaluesynchronizer import DefaultValueSynchronizer
 from sibt.infrastructure.cachingsynchronizer import CachingSynchronizer
@@ -35,6 +37,8 @@ from sibt.infrastructure.pymoduleschedulerloader import PyModuleSchedulerLoader
 from sibt.application.exceptions import RuleNameMismatchException
 from sibt.infrastructure.runnablefilefunctionmodule import \
     RunnableFileFunctionModule
+from sibt.infrastructure.diskcachingfunctionmodule import \
+    DiskCachingFunctionModule
 from sibt.configuration.optionvaluesparser import OptionValuesParser
 from sibt.infrastructure.filesdbexecutionslog import FilesDBExecutionsLog
 from sibt.application.rulesfinder import RulesFinder
@@ -42,27 +46,38 @@ from sibt.application import sshfsautomountingsynchronizer as sshfssyncer
 from sibt.configuration.configurablelist import ConfigurableList, \
     LazyConfigurable
 from collections import namedtuple
+import functools
 import os
 
 SchedulerArgs = namedtuple("SchedulerArgs", [
     "sibtInvocation", "varDir", "logger", "clock"])
 SysRulePrefix = "+"
 
-def readSynchronizers(dirs, processRunner):
+def readSynchronizers(dirs, processRunner, cacheDir=None, mountPool=None,
+    reuseCheckResults=True):
   def load(path, fileName):
     return LazyConfigurable(fileName,
-        lambda: loadSynchronizer(processRunner, path, fileName))
+        lambda: loadSynchronizer(processRunner, path, fileName, cacheDir,
+          mountPool, reuseCheckResults))
 
-  return ConfigurableList(collectFilesInDirs(dirs, load))
+  rescan = lambda: collectFilesInDirs(dirs, load)
+  return ConfigurableList(rescan(), rescan)
 
-def loadSynchronizer(processRunner, executablePath, name):
+def loadSynchronizer(processRunner, executablePath, name, cacheDir=None,
+    mountPool=None, reuseCheckResults=True):
   try:
     functionModule = RunnableFileFunctionModule(processRunner, executablePath)
+    if cacheDir is not None:
+      functionModule = DiskCachingFunctionModule(functionModule,
+          os.path.join(cacheDir, name), [executablePath] + 
+          processRunner.interpreterPathsOf(executablePath),
+          reuseTimedEntries=reuseCheckResults)
     ret = FunctionModuleSynchronizer(functionModule, name)
     ret = DefaultValueSynchronizer(ret)
     ret = CachingSynchronizer(ret)
     if sshfssyncer.isExtensible(ret):
-      ret = sshfssyncer.SSHFSAutoMountingSynchronizer(ret, processRunner)
+      ret = sshfssyncer.SSHFSAutoMountingSynchronizer(ret, processRunner,
+          mountPool)
     return ret
   except ConfigConsistencyException:
     return None
@@ -85,13 +100,23 @@ def readSchedulers(dirs, loader, schedulerWrapper, initArgs,
     ret = loadSchedulerFromModule(loader, path, name, newInitArgs)
     return schedulerWrapper(ret)
 
-  return ConfigurableList(collectFilesInDirs(dirs, lambda path, fileName:
-      LazyConfigurable(fileName, lambda: loadScheduler(path, fileName))))
+  rescan = lambda: collectFilesInDirs(dirs, lambda path, fileName:
+      LazyConfigurable(fileName, lambda: loadScheduler(path, fileName)))
+  return ConfigurableList(rescan(), rescan)
 
-def readRuleLoaders(rulesDir, includeDirs, enabledDir, factory, prefix):
-  reader = DirBasedRulesReader(CachingIniFileListReader(
-    [rulesDir] + includeDirs, dirbasedrulesreader.AllowedSections), 
-    rulesDir, enabledDir, factory, prefix)
+def readRuleLoaders(rulesDir, includeDirs, enabledDir, factory, prefix,
+    cacheDir=None, onlyRuleName=None):
+  iniFileReader = CachingIniFileListReader([rulesDir] + includeDirs, 
+      dirbasedrulesreader.AllowedSections)
+  if cacheDir is not None:
+    iniFileReader = DiskCachingIniFileListReader(iniFileReader, cacheDir)
+
+  reader = DirBasedRulesReader(iniFileReader, rulesDir, enabledDir, factory,
+      prefix)
+  if onlyRuleName is not None:
+    ret = reader.readByName(onlyRuleName)
+    if ret is not None:
+      return ret
   return list(reader.read())
 
 def createHashbangAwareProcessRunner(runnersDir, processRunner):
@@ -99,16 +124,58 @@ def createHashbangAwareProcessRunner(runnersDir, processRunner):
       lambda path, fileName: Runner(fileName, path))
   return HashbangAwareProcessRunner(runners, processRunner)
   
-def readRulesIntoFinder(paths, sysPaths, userFactory, sysFactory,
-    sysRuleFilter, readUserConf=True, readSysConf=True):
+def readRuleLoadersOfBothRepos(paths, sysPaths, userFactory, sysFactory,
+    readUserConf=True, readSysConf=True, onlyUserRuleName=None):
+  cacheDir = paths.rulesCacheDir if paths is not None else None
   userRules = [] if not readUserConf else readRuleLoaders(paths.rulesDir, 
-      [paths.readonlyIncludesDir], paths.enabledDir, userFactory, "")
+      [paths.readonlyIncludesDir], paths.enabledDir, userFactory, "", cacheDir,
+      onlyUserRuleName)
+  if onlyUserRuleName is not None:
+    readSysConf = False
   sysRules = [] if not readSysConf else readRuleLoaders(sysPaths.rulesDir, 
       [sysPaths.readonlyIncludesDir], sysPaths.enabledDir, sysFactory, 
-      SysRulePrefix)
+      SysRulePrefix, cacheDir)
+  return userRules, sysRules
 
+def readRulesIntoFinder(paths, sysPaths, userFactory, sysFactory,
+    sysRuleFilter, readUserConf=True, readSysConf=True, onlyUserRuleName=None):
+  userRules, sysRules = readRuleLoadersOfBothRepos(paths, sysPaths,
+      userFactory, sysFactory, readUserConf, readSysConf, onlyUserRuleName)
   return RulesFinder(RulesRepo(userRules), RulesRepo(sysRules), sysRuleFilter)
 
+def configDirKinds(paths, sysPaths, readSysConf):
+  ret = dict()
+  def add(directory, kind, repoIndex=None):
+    ret.setdefault(os.path.abspath(directory), []).append((kind, repoIndex))
+
+  for repoIndex, repoPaths in enumerate([paths] + ([sysPaths] if
+      readSysConf else [])):
+    add(repoPaths.rulesDir, "rules", repoIndex)
+    add(repoPaths.enabledDir, "enabled", repoIndex)
+    add(repoPaths.readonlyIncludesDir, "include", repoIndex)
+    add(repoPaths.synchronizersDir, "synchronizers")
+    add(repoPaths.schedulersDir, "schedulers")
+  add(paths.readonlySynchronizersDir, "synchronizers")
+  add(paths.readonlySchedulersDir, "schedulers")
+  add(paths.runnersDir, "runners")
+  return ret
+
+class _AffectedNames(object):
+  def __init__(self):
+    self.everything = False
+    self.names = set()
+    self.baseNames = set()
+
+  def add(self, name):
+    if name is None:
+      self.everything = True
+    else:
+      self.names.add(name)
+
+  def __call__(self, name):
+    return self.everything or name in self.names or \
+        any(name.endswith("@" + baseName) for baseName in self.baseNames)
+
 def isSysRule(rule):
   return rule.name.startswith(SysRulePrefix)
 
@@ -116,6 +183,9 @@ class _EmptyLog(object):
   def executionsOfRules(self, _):
     return dict()
 
+  def latestExecutionsOfRules(self, _, count):
+    return dict()
+
 def openLogs(paths, sysPaths):
   userLog = sysLog = _EmptyLog()
   if paths is not None:
@@ -126,21 +196,76 @@ def openLogs(paths, sysPaths):
   return userLog, sysLog
 
 class ConfigRepo(object):
-  def __init__(self, schedulers, synchronizers, rulesFinder):
+  def __init__(self, schedulers, synchronizers, rulesFinder,
+      readRuleLoaders=None, dirKinds=dict()):
     self.schedulers = schedulers
     self.synchronizers = synchronizers
     self.rulesFinder = rulesFinder
+    self._readRuleLoaders = readRuleLoaders
+    self._dirKinds = dirKinds
+
+  @property
+  def configDirs(self):
+    return list(self._dirKinds.keys())
+
+  def applyChanges(self, changedFiles):
+    if self._readRuleLoaders is None:
+      return False
+
+    repos = [self.rulesFinder.userRules, self.rulesFinder.sysRules]
+    namePrefixes = ["", SysRulePrefix]
+    affectedRules = [_AffectedNames(), _AffectedNames()]
+    affectedConfigurables = dict(synchronizers=_AffectedNames(),
+        schedulers=_AffectedNames())
+
+    for directory, fileName in changedFiles:
+      for kind, repoIndex in self._dirKinds.get(directory, []):
+        if kind == "runners":
+          return False
+        if kind in affectedConfigurables:
+          affectedConfigurables[kind].add(fileName)
+        elif kind == "include" or fileName is None or \
+            fileName.endswith(".inc"):
+          affectedRules[repoIndex].everything = True
+        elif kind == "rules":
+          affectedRules[repoIndex].add(namePrefixes[repoIndex] + fileName)
+          affectedRules[repoIndex].baseNames.add(fileName)
+        elif kind == "enabled":
+          prefix = namePrefixes[repoIndex]
+          affectedRules[repoIndex].add(prefix + fileName)
+          affectedRules[repoIndex].add(prefix + fileName.partition("@")[2])
+
+    for kind, configurables in [("synchronizers", self.synchronizers),
+        ("schedulers", self.schedulers)]:
+      affected = affectedConfigurables[kind]
+      if not affected.everything and len(affected.names) == 0:
+        continue
+      configurables.reload(None if affected.everything else affected.names)
+
+      for repo, affectedNames in zip(repos, affectedRules):
+        for rule in repo.loadedRules:
+          usedName = rule.syncerName if kind == "synchronizers" else \
+              rule.scheduler.name
+          if affected(usedName):
+            affectedNames.add(rule.name)
+
+    for repo, lazyRules, affectedNames in zip(repos, self._readRuleLoaders(),
+        affectedRules):
+      repo.refresh(lazyRules, affectedNames)
+    return True
 
   @classmethod
   def load(clazz, paths, sysPaths, readSysConf, processRunner, clock,
       moduleLoader, sibtInvocation, schedulerWrapper, 
-      makeErrorLoggerWithPrefix, sysRuleFilter):
+      makeErrorLoggerWithPrefix, sysRuleFilter, mountPool=None,
+      onlyUserRuleName=None, reuseCheckResults=True):
     processRunnerWrapper = createHashbangAwareProcessRunner(paths.runnersDir,
         processRunner)
 
     synchronizers = readSynchronizers([paths.synchronizersDir, 
       paths.readonlySynchronizersDir] + ([sysPaths.synchronizersDir] if 
-        readSysConf else []), processRunnerWrapper)
+        readSysConf else []), processRunnerWrapper, 
+        paths.synchronizersCacheDir, mountPool, reuseCheckResults)
     schedulers = readSchedulers(
         [paths.schedulersDir, paths.readonlySchedulersDir] + 
         ([sysPaths.schedulersDir] if readSysConf else []), 
@@ -156,18 +281,43 @@ class ConfigRepo(object):
     sysFactory = RuleFromStringOptionsReader(RuleFactory(sysLog),
         valuesParser, schedulers, synchronizers)
     rulesFinder = readRulesIntoFinder(paths, sysPaths, userFactory,
-        sysFactory, sysRuleFilter, readSysConf=readSysConf)
+        sysFactory, sysRuleFilter, readSysConf=readSysConf,
+        onlyUserRuleName=onlyUserRuleName)
 
-    return clazz(schedulers, synchronizers, rulesFinder)
+    return clazz(schedulers, synchronizers, rulesFinder,
+        None if onlyUserRuleName is not None else
+        functools.partial(readRuleLoadersOfBothRepos, paths, sysPaths,
+          userFactory, sysFactory, readSysConf=readSysConf),
+        configDirKinds(paths, sysPaths, readSysConf))
 
 class RulesRepo(object):
   def __init__(self, lazyRules):
-    self._namesToRules = dict((rule.name, rule) for rule in lazyRules)
-    self._ruleRead = dict((rule.name, False) for rule in lazyRules)
-    self.names = list(self._namesToRules.keys())
+    self._namesToRules = dict()
+    self._ruleRead = dict()
+    self.refresh(lazyRules)
+
+  def refresh(self, lazyRules, isAffected=lambda name: True):
+    namesToRules = dict((rule.name, rule) for rule in lazyRules)
+    ruleRead = dict((rule.name, False) for rule in lazyRules)
+    for name in namesToRules.keys():
+      if self._ruleRead.get(name, False) and not isAffected(name):
+        namesToRules[name] = self._namesToRules[name]
+        ruleRead[name] = True
+
+    self._namesToRules = namesToRules
+    self._ruleRead = ruleRead
+    self.names = list(namesToRules.keys())
     self.enabledNames = [rule.name for rule in lazyRules if rule.enabled]
     self.disabledNames = [rule.name for rule in lazyRules if not rule.enabled]
+
+  @property
+  def loadedRules(self):
+    return [self._namesToRules[name] for name, isRead in
+        self._ruleRead.items() if isRead]
   
+  def __contains__(self, name):
+    return name in self._namesToRules
+
   def getRule(self, name, keepUnloaded):
     rule = self.getRuleWithoutLoading(name)
     if not self._ruleRead[name]:
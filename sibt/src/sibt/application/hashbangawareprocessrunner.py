@@ -27,13 +27,26 @@ class HashbangAwareProcessRunner(object):
   def execute(self, program, *args):
     self.wrapped.execute(*self._modifiedArgs(program, args))
 
-  def _modifiedArgs(self, program, args):
+  def startServer(self, program, *args):
+    runner = self._runnerOf(program)
+    if runner is None or not hasattr(self.wrapped, "startServer"):
+      return None
+    return self.wrapped.startServer(runner.path, program, *args)
+
+  def interpreterPathsOf(self, program):
+    runner = self._runnerOf(program)
+    return [] if runner is None else [runner.path]
+
+  def _runnerOf(self, program):
     if os.path.isfile(program):
       with open(program, "r") as programFile:
         firstLine = programFile.readline().strip()
         if firstLine.startswith("#!"):
-          hashbangInterpreter = firstLine[2:]
-          if hashbangInterpreter in self.namesToRunners:
-            return (self.namesToRunners[hashbangInterpreter].path, 
-                program) + args
+          return self.namesToRunners.get(firstLine[2:], None)
+    return None
+
+  def _modifiedArgs(self, program, args):
+    runner = self._runnerOf(program)
+    if runner is not None:
+      return (runner.path, program) + args
     return (program,) + args
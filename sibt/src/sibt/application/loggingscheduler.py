@@ -20,7 +20,7 @@ from sibt.application.execenvironment import ExecEnvironment
 
 from sibt.infrastructure.teelogger import TeeLogger
 from sibt.infrastructure.filelogger import FileLogger
-from sibt.infrastructure.utillinuxsyslogger import UtilLinuxSysLogger
+from sibt.infrastructure.nativesyslogger import NativeSysLogger
 
 import traceback
 
@@ -68,7 +68,7 @@ class LoggingScheduler(object):
       ret.append(_FileLikeOutputWrapper(self._stderr))
 
     if scheduling.options.get("Syslog", True):
-      ret.append(UtilLinuxSysLogger(scheduling.options.get("SyslogOptions", ""),
+      ret.append(NativeSysLogger(scheduling.options.get("SyslogOptions", ""),
         prefix=scheduling.ruleName.encode(), tag="sibt"))
 
     return ret
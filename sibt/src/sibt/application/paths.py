@@ -41,6 +41,15 @@ class Paths(object):
   def lockDir(self):
     return os.path.join(self.varDir, "locks")
   @property
+  def synchronizersCacheDir(self):
+    return os.path.join(self.varDir, "cache", "synchronizers")
+  @property
+  def rulesCacheDir(self):
+    return os.path.join(self.varDir, "cache", "rules")
+  @property
+  def checksCacheDir(self):
+    return os.path.join(self.varDir, "cache", "checks")
+  @property
   def readonlySchedulersDir(self):
     return os.path.join(self.readonlyDir, "schedulers")
   @property
@@ -14,9 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from fnmatch import fnmatchcase
+from fnmatch import translate
 from sibt.application.exceptions import RulePatternMismatchException
 import itertools
+import functools
+import re
 from sibt.configuration.exceptions import MissingConfigValuesException, \
     NotReadableException
 
@@ -26,6 +28,9 @@ class EmptyRepo(object):
     self.disabledNames = []
     self.names = []
 
+  def __contains__(self, name):
+    return False
+
 class RuleNameMatch(object):
   def __init__(self, isDirect, isSysRule, name):
     self.isDirect = isDirect
@@ -37,13 +42,31 @@ class RuleNameMatch(object):
   def __hash__(self):
     return hash(self.name)
 
-def _matchNamesAgainstPattern(pattern, enabledNames, disabledNames,
-    isSysConfig):
-  if pattern in disabledNames or pattern in enabledNames:
-    return [RuleNameMatch(True, isSysConfig, pattern)]
-
-  return [RuleNameMatch(False, isSysConfig, name) for name in enabledNames if 
-      fnmatchcase(name, pattern)]
+@functools.lru_cache(maxsize=64)
+def _compiledPatterns(patterns):
+  return re.compile("|".join("(?:{0})".format(translate(pattern)) for 
+    pattern in patterns))
+
+def _matchNamesAgainstPatterns(patterns, repo, names, isSysConfig):
+  ret = [None] * len(patterns)
+  wildcardPatterns = []
+  for i, pattern in enumerate(patterns):
+    if pattern in repo:
+      ret[i] = [RuleNameMatch(True, isSysConfig, pattern)]
+    elif pattern == "*":
+      ret[i] = [RuleNameMatch(False, isSysConfig, name) for name in names]
+    else:
+      wildcardPatterns.append(pattern)
+
+  if len(wildcardPatterns) > 0:
+    anyPattern = _compiledPatterns(tuple(wildcardPatterns))
+    candidates = [name for name in names if anyPattern.match(name)]
+    for i, pattern in enumerate(patterns):
+      if ret[i] is None:
+        regex = _compiledPatterns((pattern,))
+        ret[i] = [RuleNameMatch(False, isSysConfig, name) for name in 
+            candidates if regex.match(name)]
+  return ret
 
 class RulesFinder(object):
   def __init__(self, userRules, sysRules, sysRuleFilter):
@@ -83,15 +106,11 @@ class RulesFinder(object):
 
   def _findMatchesInRepo(self, repo, patterns, matchAgainstDisabled, 
       isSysConfig):
-    enabledNames = repo.enabledNames
-    disabledNames = repo.disabledNames
-
+    names = repo.enabledNames
     if matchAgainstDisabled:
-      enabledNames += disabledNames
-      disabledNames = []
+      names = names + repo.disabledNames
 
-    return [_matchNamesAgainstPattern(pattern, enabledNames, 
-      disabledNames, isSysConfig) for pattern in patterns]
+    return _matchNamesAgainstPatterns(patterns, repo, names, isSysConfig)
 
   def _matchesListsToRules(self, matchesLists, keepUnloadedRules):
     matches = set(_flatten(matchesLists))
@@ -113,12 +132,12 @@ class RulesFinder(object):
       yield rule
 
   def _findRuleByName(self, name, keepUnloadedRule):
-    repo = self.userRules if name in self.userRules.names else \
+    repo = self.userRules if name in self.userRules else \
         self.sysRules
     return repo.getRule(name, keepUnloadedRule)
 
   def _getUnloadedRule(self, name):
-    repo = self.userRules if name in self.userRules.names else \
+    repo = self.userRules if name in self.userRules else \
         self.sysRules
     return repo.getRuleWithoutLoading(name)
 
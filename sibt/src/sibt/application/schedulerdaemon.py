@@ -0,0 +1,179 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sibt.infrastructure.location import forgetResolvedPaths
+from sibt.domain.exceptions import LockException
+
+def configFilesStamp(dirs):
+  ret = []
+  for directory in dirs:
+    try:
+      fileNames = sorted(os.listdir(directory))
+    except FileNotFoundError:
+      ret.append((directory, None))
+      continue
+    for fileName in fileNames:
+      try:
+        stat = os.stat(os.path.join(directory, fileName))
+        ret.append((directory, fileName, stat.st_mtime_ns, stat.st_size))
+      except FileNotFoundError:
+        pass
+  return ret
+
+class SchedulerDaemon(object):
+  def __init__(self, loadConfigRepo, configStamp, executeRule, clock,
+      errorLogger, schedulerName="daemon", workerCount=None, maxSleepInS=60,
+      watcher=None):
+    self._loadConfigRepo = loadConfigRepo
+    self._configStamp = configStamp
+    self._watcher = watcher
+    self._executeRule = executeRule
+    self._clock = clock
+    self._errorLogger = errorLogger
+    self.schedulerName = schedulerName
+    self.maxSleepInS = maxSleepInS
+
+    self._executor = ThreadPoolExecutor(workerCount)
+    self._lock = threading.Lock()
+    self._wakeUp = threading.Event()
+    self._runningRuleNames = set()
+    self._configRepo = None
+    self._loadedStamp = None
+    self._changedFiles = []
+    self._reportedErrors = set()
+
+  def run(self):
+    if self._watcher is not None:
+      watcherThread = threading.Thread(target=self._collectChanges,
+          daemon=True)
+      watcherThread.start()
+
+    try:
+      while True:
+        self._wakeUp.wait(self.runDueRules())
+        self._wakeUp.clear()
+    finally:
+      if len(self._runningRuleNames) > 0:
+        self._errorLogger.log("waiting for executions")
+      self._executor.shutdown(wait=True)
+
+  def runDueRules(self):
+    forgetResolvedPaths()
+    self._reloadConfigIfChanged()
+    now = self._clock.now()
+    ret = self.maxSleepInS
+
+    for rule in self._daemonRules():
+      with self._lock:
+        if rule.name in self._runningRuleNames:
+          continue
+      rule.forgetCachedExecutions()
+      nextExecution = rule.nextExecution
+      if nextExecution is None:
+        continue
+
+      if nextExecution.startTime <= now:
+        self._start(rule)
+      else:
+        ret = min(ret, (nextExecution.startTime - now).total_seconds())
+
+    return ret
+
+  def _collectChanges(self):
+    try:
+      while True:
+        changedFiles = self._watcher.waitForChanges()
+        with self._lock:
+          self._changedFiles.extend(changedFiles)
+        self._wakeUp.set()
+    except Exception as ex:
+      self._errorLogger.log("watching the configuration failed, comparing "
+          "config files on each pass instead: {0}", str(ex))
+      with self._lock:
+        self._watcher = None
+      self._wakeUp.set()
+
+  def _reloadConfigIfChanged(self):
+    if self._configRepo is not None and self._watcher is not None:
+      with self._lock:
+        changedFiles = self._changedFiles
+        self._changedFiles = []
+      if len(changedFiles) == 0:
+        return
+      self._reportedErrors = set()
+      try:
+        if self._configRepo.applyChanges(changedFiles):
+          return
+      except Exception as ex:
+        self._errorLogger.log("applying configuration changes failed, "
+            "reloading everything: {0}", str(ex))
+    else:
+      stamp = self._configStamp()
+      if self._configRepo is not None and stamp == self._loadedStamp:
+        return
+      self._loadedStamp = stamp
+
+    self._reportedErrors = set()
+    try:
+      self._configRepo = self._loadConfigRepo()
+    except Exception as ex:
+      if self._configRepo is None:
+        raise
+      self._errorLogger.log("reloading configuration failed, keeping the "
+          "previous one: {0}", str(ex))
+
+  def _daemonRules(self):
+    rulesFinder = self._configRepo.rulesFinder
+    ret = []
+    for name in rulesFinder.userRules.enabledNames:
+      try:
+        rule = rulesFinder.getSyncRule(name)
+      except Exception as ex:
+        if (name, str(ex)) not in self._reportedErrors:
+          self._reportedErrors.add((name, str(ex)))
+          self._errorLogger.log("loading rule ‘{0}’ failed: {1}", name,
+              str(ex))
+        continue
+      if rule.scheduler.name == self.schedulerName:
+        ret.append(rule)
+    return ret
+
+  def _start(self, rule):
+    with self._lock:
+      self._runningRuleNames.add(rule.name)
+    self._executor.submit(self._execute, rule)
+
+  def _execute(self, rule):
+    wakeUp = True
+    try:
+      self._executeRule(rule)
+    except LockException:
+      wakeUp = False
+      self._errorLogger.log(
+          "‘{0}’ is already executing, could not acquire lock", rule.name,
+          verbosity=1)
+    except Exception as ex:
+      self._errorLogger.log("executing rule ‘{0}’ failed: {1}", rule.name,
+          str(ex))
+    finally:
+      with self._lock:
+        self._runningRuleNames.discard(rule.name)
+      if wakeUp:
+        self._wakeUp.set()
@@ -18,16 +18,44 @@ from sibt.infrastructure import types
 from sibt.domain.optioninfo import OptionInfo
 
 import subprocess
+import hashlib
+import re
+import json
+import os
+import tempfile
 
 Options = [
     OptionInfo("ExecOnFailure", types.String),
     OptionInfo("ExecBefore", types.String),
     OptionInfo("ExecOnSuccess", types.String)]
 
+ScriptOptionNames = ["ExecOnFailure", "ExecBefore", "ExecOnSuccess"]
+MaxCachedSyntaxChecks = 1000
+
+# Each script is parsed by an eval of its own so that the parser state of
+# one cannot leak into the next; the functions are defined but never called
+BatchSyntaxCheckScript = (r'for script in "$@"; do eval "__sibt_check() { '
+    r"""$script | cat"$'\n'"}"; printf '\0' >&2; done""")
+# Scripts that might close that function early are checked on their own
+ClosingBraceRegex = re.compile(r"(?:^|[\s;&|()<>])\}")
+
+def _keyOf(code):
+  return hashlib.sha256(code.encode()).hexdigest()
+
+def _stderrOf(args):
+  with subprocess.Popen(args, stdout=subprocess.DEVNULL, 
+      stderr=subprocess.PIPE) as process:
+    _, stderrBytes = process.communicate()
+    process.wait()
+  return stderrBytes.decode()
+
 class ScriptRunningScheduler(object):
-  def __init__(self, wrappedSched):
+  def __init__(self, wrappedSched, cacheDir=None):
     self._wrapped = wrappedSched
     self.availableOptions = wrappedSched.availableOptions + Options
+    self.cacheDir = cacheDir
+    self._syntaxErrors = None
+    self._syntaxErrorsChanged = False
 
   def _executeScript(self, execEnv, scheduling, optionName):
     if optionName in scheduling.options:
@@ -58,21 +86,86 @@ class ScriptRunningScheduler(object):
     return succeeded
 
   def check(self, schedulings):
+    self._checkSyntaxOfAllAtOnce(scheduling.options[optionName] for 
+        scheduling in schedulings for optionName in ScriptOptionNames if
+        optionName in scheduling.options)
+
     ret = []
     ret.extend(schedulings.checkOptionsOfEach(self._checkScriptSyntax,
-      "ExecOnFailure", "ExecBefore", "ExecOnSuccess"))
+      *ScriptOptionNames))
+    self._saveSyntaxErrors()
     ret.extend(self._wrapped.check(schedulings))
     return ret
 
   def _checkScriptSyntax(self, optionName, code, ruleName):
-    with subprocess.Popen(["bash", "-n", "-c", code + " | cat"], 
-        stderr=subprocess.PIPE) as process:
-      _, stderrBytes = process.communicate()
-      process.wait()
-    syntaxErrors = stderrBytes.decode()
+    syntaxErrors = self._syntaxErrorsOf(code)
     if len(syntaxErrors) > 0:
       return "syntax errors in {0} code of ‘{1}’:\n{2}".format(
         optionName, ruleName, syntaxErrors)
 
+  def _checkSyntaxOfAllAtOnce(self, codes):
+    knownErrors = self._loadSyntaxErrors()
+    uncheckedCodes = list(dict((_keyOf(code), code) for code in codes if 
+        _keyOf(code) not in knownErrors).values())
+    if len(uncheckedCodes) == 0:
+      return
+
+    for code, syntaxErrors in zip(uncheckedCodes, 
+        self._runSyntaxChecks(uncheckedCodes)):
+      knownErrors[_keyOf(code)] = syntaxErrors
+    self._syntaxErrorsChanged = True
+
+  def _syntaxErrorsOf(self, code):
+    self._checkSyntaxOfAllAtOnce([code])
+    return self._loadSyntaxErrors()[_keyOf(code)]
+
+  def _runSyntaxChecks(self, codes):
+    ret = dict((code, self._runSyntaxCheck(code)) for code in codes if
+        ClosingBraceRegex.search(code) is not None)
+    batch = [code for code in codes if code not in ret]
+    if len(batch) > 0:
+      ret.update(zip(batch, self._runSyntaxCheckOfBatch(batch)))
+    return [ret[code] for code in codes]
+
+  def _runSyntaxCheck(self, code):
+    return _stderrOf(["bash", "-n", "-c", code + " | cat"])
+
+  def _runSyntaxCheckOfBatch(self, codes):
+    return _stderrOf(["bash", "-c", BatchSyntaxCheckScript, "bash"] + 
+        codes).split("\0")[:len(codes)]
+
+  def _loadSyntaxErrors(self):
+    if self._syntaxErrors is None:
+      self._syntaxErrors = dict()
+      if self.cacheDir is not None:
+        try:
+          with open(self._cachePath, "r") as cacheFile:
+            self._syntaxErrors = dict(json.load(cacheFile))
+        except (OSError, ValueError, TypeError):
+          pass
+    return self._syntaxErrors
+
+  def _saveSyntaxErrors(self):
+    if self.cacheDir is None or not self._syntaxErrorsChanged:
+      return
+    self._syntaxErrorsChanged = False
+    entries = list(self._syntaxErrors.items())[-MaxCachedSyntaxChecks:]
+    try:
+      os.makedirs(self.cacheDir, exist_ok=True)
+      fd, tempPath = tempfile.mkstemp(dir=self.cacheDir, prefix=".")
+      try:
+        with os.fdopen(fd, "w") as tempFile:
+          json.dump(entries, tempFile)
+        os.replace(tempPath, self._cachePath)
+      except:
+        os.remove(tempPath)
+        raise
+    except OSError:
+      pass
+
+  @property
+  def _cachePath(self):
+    return os.path.join(self.cacheDir, "script-syntax")
+
   def __getattr__(self, name):
     return getattr(self._wrapped, name)
@@ -26,6 +26,7 @@ GlobalOpts = [OptArg("config-dir", noOfArgs="1"),
   OptArg("verbose", "v"),
   OptArg("tty"),
   OptArg("utc"),
+  OptArg("jobs", "j", noOfArgs="1"),
   OptArg("version")]
 
 class CmdLineArgs(object):
@@ -96,6 +97,8 @@ class SibtArgsParser(object):
       SubGroup("execute-rule",
         PosArg("rule-name"), description=None),
 
+      SubGroup("daemon"),
+
       default="list")])
 
   def parseArgs(self, args, stdout, stderr):
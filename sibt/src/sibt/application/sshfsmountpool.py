@@ -0,0 +1,142 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import tempfile
+import threading
+
+from sibt.application.locationformatter import locToSSHFSArgs
+
+class _Mount(object):
+  def __init__(self):
+    self.mountPoint = None
+    self.error = None
+    self.mounted = threading.Event()
+    self.refCount = 0
+    self.idleTimer = None
+
+class SSHFSMountPool(object):
+  def __init__(self, processRunner, idleTimeout=None):
+    self._processRunner = processRunner
+    self.idleTimeout = idleTimeout
+    self._mounts = dict()
+    self._lock = threading.Lock()
+
+  def _keyOf(self, loc, remoteShellCommand):
+    return (loc.host, loc.login, loc.port, loc.path, remoteShellCommand)
+
+  def acquire(self, loc, remoteShellCommand):
+    key = self._keyOf(loc, remoteShellCommand)
+    with self._lock:
+      mount = self._mounts.get(key, None)
+      isNew = mount is None
+      if isNew:
+        mount = _Mount()
+        self._mounts[key] = mount
+
+      if mount.idleTimer is not None:
+        mount.idleTimer.cancel()
+        mount.idleTimer = None
+      mount.refCount += 1
+
+    if isNew:
+      try:
+        mount.mountPoint = self._mount(loc, remoteShellCommand)
+      except BaseException as ex:
+        mount.error = ex
+        with self._lock:
+          if self._mounts.get(key, None) is mount:
+            del self._mounts[key]
+        raise
+      finally:
+        mount.mounted.set()
+    else:
+      mount.mounted.wait()
+      if mount.error is not None:
+        raise mount.error
+
+    return mount.mountPoint
+
+  def release(self, loc, remoteShellCommand):
+    key = self._keyOf(loc, remoteShellCommand)
+    with self._lock:
+      mount = self._mounts[key]
+      mount.refCount -= 1
+      if mount.refCount > 0 or self.idleTimeout is None:
+        return
+
+      if self.idleTimeout > 0:
+        mount.idleTimer = threading.Timer(self.idleTimeout,
+            self._removeIfIdle, (key, mount))
+        mount.idleTimer.daemon = True
+        mount.idleTimer.start()
+        return
+      self._pop(key)
+
+    self._unmount(mount)
+
+  def close(self):
+    firstException = None
+    with self._lock:
+      mounts = [self._pop(key) for key in list(self._mounts.keys())]
+    for mount in mounts:
+      try:
+        self._unmount(mount)
+      except BaseException as ex:
+        if firstException is None:
+          firstException = ex
+    if firstException is not None:
+      raise firstException
+
+  def _removeIfIdle(self, key, mount):
+    with self._lock:
+      if self._mounts.get(key, None) is not mount or mount.refCount > 0:
+        return
+      self._pop(key)
+    self._unmount(mount)
+
+  def _pop(self, key):
+    mount = self._mounts.pop(key)
+    if mount.idleTimer is not None:
+      mount.idleTimer.cancel()
+    return mount
+
+  def _mount(self, loc, remoteShellCommand):
+    tempDir = tempfile.mkdtemp(prefix="sibt-sshfs-mount")
+    mountPoint = os.path.join(tempDir, "mount")
+    os.mkdir(mountPoint)
+
+    args = locToSSHFSArgs(loc)
+    args += [mountPoint]
+    if remoteShellCommand is not None:
+      args += ["-o", "ssh_command=" + remoteShellCommand]
+
+    try:
+      self._processRunner.execute("sshfs", *args)
+    except BaseException:
+      os.rmdir(mountPoint)
+      os.rmdir(tempDir)
+      raise
+    return mountPoint
+
+  def _unmount(self, mount):
+    mount.mounted.wait()
+    if mount.mountPoint is None:
+      return
+    self._processRunner.execute("fusermount", "-u", mount.mountPoint)
+    os.rmdir(mount.mountPoint)
+    os.rmdir(os.path.dirname(mount.mountPoint))
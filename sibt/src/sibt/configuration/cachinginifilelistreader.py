@@ -28,10 +28,18 @@ def _flatten(xss):
 def _makeException(file, message):
   return ConfigSyntaxException("rule", None, message, file)
 
+class _ParsedFile(object):
+  def __init__(self, importedNames, rawSections):
+    self.importedNames = importedNames
+    self.rawSections = rawSections
+
 class CachingIniFileListReader(object):
   def __init__(self, includeDirs, allowedSections):
     self.includeDirs = includeDirs
     self.allowedSections = allowedSections + ["Global"]
+    self._parsedFiles = dict()
+    self._includeFiles = dict()
+    self._resolvedReadLists = dict()
 
   def _throwIfSectionIsNotAllowed(self, sectionNames, filePath):
     for sectionName in sectionNames:
@@ -52,35 +60,68 @@ class CachingIniFileListReader(object):
     except configparser.InterpolationMissingOptionError as ex:
       raise MissingConfigValuesException("rule", None, filePath) from ex
 
-  def _parseFileWithParser(self, filePath, parser):
+  def _parseLinesWithParser(self, filePath, lines, parser):
     try:
-      with open(filePath, "r", errors="surrogateescape") as file:
-        parser.read_file(itertools.chain(["[{0}]\n".format(DefaultSec)], file), 
-            source=filePath)
+      parser.read_file(itertools.chain(["[{0}]\n".format(DefaultSec)], lines), 
+          source=filePath)
     except configparser.Error as ex:
       raise _makeException(filePath, "wrong syntax") from ex
 
-  def _findIncludeFile(self, name):
-    path = None
-    for directory in self.includeDirs:
-      path = os.path.join(directory, name)
-      if os.path.isfile(path):
-        return path
-    return path
+  def _parseFile(self, filePath):
+    if filePath not in self._parsedFiles:
+      with open(filePath, "r", errors="surrogateescape") as file:
+        lines = file.readlines()
 
-  def _pathsImportedFrom(self, iniFilePath):
-    with open(iniFilePath, "r", errors="surrogateescape") as iniFile:
-      lines = [line.strip() for line in iniFile.readlines()]
-      importedNames = [" ".join(line.split(" ")[1:]) for line in lines if 
-          line.startswith("#import")]
+      importedNames = [" ".join(line.strip().split(" ")[1:]) + ".inc" for 
+          line in lines if line.strip().startswith("#import")]
+      subParser = self._makeParser()
+      self._parseLinesWithParser(filePath, lines, subParser)
 
-    return [self._findIncludeFile(name + ".inc") for name in importedNames]
+      self._parsedFiles[filePath] = _ParsedFile(importedNames,
+          self._parserToSectionsDict(subParser, filePath, raw=True))
+    return self._parsedFiles[filePath]
 
-  def _recursivelyResolvedReadListOf(self, iniFilePath):
+  def _includeFileCandidates(self, name):
+    return [os.path.join(directory, name) for directory in self.includeDirs]
+
+  def _findIncludeFile(self, name):
+    if name not in self._includeFiles:
+      path = None
+      for path in self._includeFileCandidates(name):
+        if os.path.isfile(path):
+          break
+      self._includeFiles[name] = path
+    return self._includeFiles[name]
+
+  def _namesImportedFrom(self, iniFilePath):
+    return self._parseFile(iniFilePath).importedNames
+
+  def _pathsImportedFrom(self, iniFilePath):
+    return [self._findIncludeFile(name) for name in 
+        self._namesImportedFrom(iniFilePath)]
+
+  def _recursivelyResolvedReadListOf(self, iniFilePath, importingPaths=()):
+    if iniFilePath in importingPaths:
+      raise _makeException(importingPaths[-1], 
+          "cyclic #import of {0}".format(iniFilePath))
+
+    if iniFilePath not in self._resolvedReadLists:
+      ret = []
+      for importedPath in self._pathsImportedFrom(iniFilePath):
+        ret.extend(self._recursivelyResolvedReadListOf(importedPath,
+          importingPaths + (iniFilePath,)))
+      ret.append(iniFilePath)
+      self._resolvedReadLists[iniFilePath] = ret
+    return self._resolvedReadLists[iniFilePath]
+
+  def filesAffecting(self, paths):
     ret = []
-    for importedPath in self._pathsImportedFrom(iniFilePath):
-      ret.extend(self._recursivelyResolvedReadListOf(importedPath))
-    ret.append(iniFilePath)
+    for path in _flatten([self._recursivelyResolvedReadListOf(path) for 
+        path in paths]):
+      ret.append(path)
+      for name in self._namesImportedFrom(path):
+        ret.extend(itertools.takewhile(lambda candidate: 
+          not os.path.isfile(candidate), self._includeFileCandidates(name)))
     return ret
 
   def _removeUnderscoreOptions(self, sections):
@@ -100,9 +141,7 @@ class CachingIniFileListReader(object):
 
   def _readFilesInOrder(self, parser, paths):
     for path in paths:
-      subParser = self._makeParser()
-      self._parseFileWithParser(path, subParser)
-      parser.read_dict(self._parserToSectionsDict(subParser, path, raw=True))
+      parser.read_dict(self._parseFile(path).rawSections)
 
   def sectionsFromFiles(self, paths, instanceArgument):
     defaultValues = { "_instanceName": instanceArgument } if \
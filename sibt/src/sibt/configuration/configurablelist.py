@@ -27,10 +27,24 @@ class LazyConfigurable(object):
 NotFound = object()
 
 class ConfigurableList(object):
-  def __init__(self, configurables):
+  def __init__(self, configurables, rescan=None):
     self._configurables = dict((configurable.name, configurable) for 
         configurable in configurables)
     self._loadedConfigurables = dict()
+    self._rescan = rescan
+
+  def reload(self, names=None):
+    freshConfigurables = dict((configurable.name, configurable) for
+        configurable in self._rescan())
+    if names is None:
+      names = set(self._configurables.keys()) | set(freshConfigurables.keys())
+
+    for name in names:
+      self._loadedConfigurables.pop(name, None)
+      if name in freshConfigurables:
+        self._configurables[name] = freshConfigurables[name]
+      else:
+        self._configurables.pop(name, None)
 
   def _load(self, configurable):
     if configurable.name in self._loadedConfigurables:
@@ -28,6 +28,9 @@ SyncerSec = "Synchronizer"
 SchedSec = "Scheduler"
 AllowedSections = [RuleSec, SyncerSec, SchedSec]
 
+def _pathOf(directory, fileName):
+  return os.path.join(os.path.abspath(directory), fileName)
+
 class DirBasedRulesReader(object):
   def __init__(self, confFileReader, rulesDir, enabledDir, factory, namePrefix):
     self.rulesDir = rulesDir
@@ -41,9 +44,50 @@ class DirBasedRulesReader(object):
     return [rule for instancesList in collectFilesInDirs([self.rulesDir], 
       self._readInstancesFromBaseRule) for rule in instancesList]
 
+  def readByName(self, name):
+    instances = []
+    for fileName in [name, "@" + name]:
+      if not self._isConfigFile(self.enabledDir, fileName):
+        continue
+      for i, char in enumerate(fileName):
+        baseRuleName = fileName[i + 1:]
+        if char == "@" and self._isBaseRule(baseRuleName):
+          instances.append(self._buildLazyInstance(
+            _pathOf(self.rulesDir, baseRuleName), baseRuleName, True, 
+            _pathOf(self.enabledDir, fileName), fileName))
+
+    if len(instances) > 1:
+      return None
+    if len(instances) == 1 or not self._isBaseRule(name):
+      return instances
+
+    try:
+      enabledFileNames = os.listdir(self.enabledDir)
+    except FileNotFoundError:
+      enabledFileNames = []
+    if any(fileName.endswith("@" + name) and 
+        self._isConfigFile(self.enabledDir, fileName) for 
+        fileName in enabledFileNames):
+      return []
+    baseRulePath = _pathOf(self.rulesDir, name)
+    return [self._buildLazyInstance(baseRulePath, name, False, baseRulePath,
+      "@" + name)]
+
+  def _isConfigFile(self, directory, fileName):
+    return fileName != "" and not fileName.startswith(".") and \
+        "/" not in fileName and \
+        os.path.isfile(_pathOf(directory, fileName))
+
+  def _isBaseRule(self, baseRuleName):
+    return not self._isIgnored(baseRuleName) and \
+        self._isConfigFile(self.rulesDir, baseRuleName)
+
+  def _isIgnored(self, baseRuleName):
+    return any(baseRuleName.endswith(extension) for extension in 
+        self.extensionsToIgnore)
+
   def _readInstancesFromBaseRule(self, baseRulePath, baseRuleName):
-    if any(baseRuleName.endswith(extension) for extension in 
-        self.extensionsToIgnore):
+    if self._isIgnored(baseRuleName):
       return None
 
     instances =  collectFilesInDirs([self.enabledDir], functools.partial(
@@ -0,0 +1,80 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import hashlib
+import tempfile
+
+def _statOf(path):
+  try:
+    stat = os.stat(path)
+    return [path, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size]
+  except FileNotFoundError:
+    return [path, None, None, None]
+
+class DiskCachingIniFileListReader(object):
+  def __init__(self, wrapped, cacheDir):
+    self.wrapped = wrapped
+    self.cacheDir = cacheDir
+
+  def sectionsFromFiles(self, paths, instanceArgument):
+    key = [list(paths), instanceArgument]
+    encodedKey = json.dumps(key)
+    cachePath = os.path.join(self.cacheDir,
+        hashlib.sha1(encodedKey.encode()).hexdigest())
+
+    ret = self._load(cachePath, key)
+    if ret is not None:
+      return ret
+
+    try:
+      fileStats = [_statOf(path) for path in
+          self.wrapped.filesAffecting(paths)]
+    except OSError:
+      return self.wrapped.sectionsFromFiles(paths, instanceArgument)
+
+    ret = self.wrapped.sectionsFromFiles(paths, instanceArgument)
+    self._save(cachePath, dict(key=key, files=fileStats, sections=ret))
+    return ret
+
+  def _load(self, cachePath, key):
+    try:
+      with open(cachePath, "r") as cacheFile:
+        entry = json.load(cacheFile)
+      if entry["key"] == key and all(_statOf(fileStat[0]) == fileStat for
+          fileStat in entry["files"]):
+        return entry["sections"]
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+      pass
+    return None
+
+  def _save(self, cachePath, entry):
+    try:
+      os.makedirs(self.cacheDir, exist_ok=True)
+      fd, tempPath = tempfile.mkstemp(dir=self.cacheDir, prefix=".")
+      try:
+        with os.fdopen(fd, "w") as tempFile:
+          json.dump(entry, tempFile)
+        os.replace(tempPath, cachePath)
+      except:
+        os.remove(tempPath)
+        raise
+    except OSError:
+      pass
+
+  def __getattr__(self, name):
+    return getattr(self.wrapped, name)
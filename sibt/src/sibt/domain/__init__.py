@@ -18,7 +18,7 @@ from sibt.domain.validatorcollectionvalidator import \
     ValidatorCollectionValidator
 from sibt.domain import subvalidators
 
-def constructRulesValidator(additionalValidators=[]):
+def constructRulesValidator(additionalValidators=[], mapFunc=None):
   return ValidatorCollectionValidator([[ 
       subvalidators.LocExistenceValidator()
     ], [ 
@@ -27,5 +27,5 @@ def constructRulesValidator(additionalValidators=[]):
       subvalidators.NoSourceDirOverwriteValidator(),
       subvalidators.AllSharedOptsEqualValidator(),
       subvalidators.SchedulerCheckValidator(),
-      subvalidators.SynchronizerCheckValidator()
+      subvalidators.SynchronizerCheckValidator(mapFunc)
     ] + additionalValidators])
@@ -17,16 +17,35 @@
 from sibt.infrastructure.caseclassequalityhashcode import \
     CaseClassEqualityHashCode
 
-class Execution(CaseClassEqualityHashCode):
+class Execution(object):
   def __init__(self, startTime, output, result):
     self.startTime = startTime
-    self.output = output
+    self._output = output
     self._result = result
     self.finished = result is not None
 
     if self.finished:
       self.endTime = result.endTime
       self.succeeded = result.succeeded
+
+  @property
+  def output(self):
+    if callable(self._output):
+      self._output = self._output()
+    return self._output
+
+  def _fields(self):
+    return self.startTime, self.output, self._result
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and \
+        self._fields() == other._fields()
+
+  def __ne__(self, other):
+    return not self.__eq__(other)
+
+  def __hash__(self):
+    return hash(self._fields())
   
   def __repr__(self):
     return "Execution{0}".format((self.startTime, self.output, self._result))
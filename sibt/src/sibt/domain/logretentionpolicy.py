@@ -0,0 +1,53 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from sibt.infrastructure.caseclassequalityhashcode import \
+    CaseClassEqualityHashCode
+
+class LogRetentionPolicy(CaseClassEqualityHashCode):
+  def __init__(self, keepLast=None, keepFor=None, keepFailedFor=None,
+      compact=False):
+    self.keepLast = keepLast
+    self.keepFor = keepFor
+    self.keepFailedFor = keepFailedFor
+    self.compact = compact
+
+  @classmethod
+  def fromRuleOptions(clazz, options):
+    return clazz(options.get("KeepLogs"), options.get("KeepLogsFor"),
+        options.get("KeepFailedLogsFor"), options.get("CompactLogs", False))
+
+  @property
+  def expiresAnything(self):
+    return self.keepLast is not None or self.keepFor is not None
+
+  def isExpired(self, execution, numberOfNewerExecutions, now):
+    if not self.expiresAnything or not execution.finished:
+      return False
+    if self.keepLast is not None and numberOfNewerExecutions < self.keepLast:
+      return False
+
+    age = now - execution.endTime
+    if self.keepFor is not None and age < self.keepFor:
+      return False
+    if not execution.succeeded and self.keepFailedFor is not None and \
+        age < self.keepFailedFor:
+      return False
+    return True
+
+  def __repr__(self):
+    return "LogRetentionPolicy{0}".format((self.keepLast, self.keepFor,
+      self.keepFailedFor, self.compact))
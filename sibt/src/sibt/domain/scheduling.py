@@ -18,11 +18,12 @@ from sibt.infrastructure.caseclassequalityhashcode import \
     CaseClassEqualityHashCode
 
 class Scheduling(CaseClassEqualityHashCode):
-  def __init__(self, ruleName, options, lastExecutionTime):
+  def __init__(self, ruleName, options, lastExecutionTime, destinations=()):
     self.ruleName = ruleName
     self.options = options
     self.lastExecutionTime = lastExecutionTime
+    self.destinations = destinations
 
   def __repr__(self):
     return "Scheduling{0}".format((self.ruleName, self.options, 
-      self.lastExecutionTime))
+      self.lastExecutionTime, self.destinations))
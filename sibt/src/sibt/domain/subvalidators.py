@@ -34,22 +34,24 @@ class ErrorsList(object):
   def _errMsg(self, message, ruleDescriptions):
     return "in " + ", ".join(ruleDescriptions) + ": " + message
 
+def _sequentialMap(func, xs):
+  return list(map(func, xs))
+
 class DiscreteValidator(object):
-  def validate(self, ruleSet):
-    errorsList = ErrorsList()
-    for rule in ruleSet:
-      self.checkRule(rule, ruleSet, errorsList)
-    return errorsList.errors
+  def __init__(self, mapFunc=None):
+    self.mapFunc = mapFunc
 
-class SetsOfTwoValidator(object):
   def validate(self, ruleSet):
-    errorsList = ErrorsList()
-    ruleList = list(ruleSet)
-    for i, rule in enumerate(ruleList):
-      for rule2 in ruleList[i+1:]:
-        self.checkPair(rule, rule2, errorsList)
+    rules = list(ruleSet)
+    def errorsOfRule(rule):
+      errorsList = ErrorsList()
+      self.checkRule(rule, ruleSet, errorsList)
+      return errorsList.errors
 
-    return errorsList.errors
+    mapFunc = self.mapFunc if self.mapFunc is not None and len(rules) > 1 \
+        else _sequentialMap
+    return [error for errors in mapFunc(errorsOfRule, rules) for
+        error in errors]
 
 class SynchronizerCheckValidator(DiscreteValidator):
   def checkRule(self, rule, _, errors):
@@ -102,13 +104,55 @@ class LocNotEmptyValidator(DiscreteValidator):
       if loc.isEmpty:
         errors.add(formatLoc(loc) + " is empty", rule)
 
-class NoOverlappingWritesValidator(SetsOfTwoValidator):
-  def checkPair(self, rule1, rule2, errors):
-    for writeLoc1 in rule1.writeLocs:
-      for writeLoc2 in rule2.writeLocs:
-        if writeLoc2.contains(writeLoc1) or writeLoc1.contains(writeLoc2):
-          errors.add(formatLoc(writeLoc1) + ", " + 
-            formatLoc(writeLoc2) + ": overlapping writes", rule1, rule2)
+class _PathTrie(object):
+  def __init__(self):
+    self._root = ([], dict())
+
+  def insert(self, components, value):
+    node = self._root
+    for component in components:
+      node = node[1].setdefault(component, ([], dict()))
+    node[0].append(value)
+
+  def valuesAlong(self, components):
+    node = self._root
+    yield from node[0]
+    for component in components:
+      node = node[1].get(component)
+      if node is None:
+        return
+      yield from node[0]
+
+class NoOverlappingWritesValidator(object):
+  def validate(self, ruleSet):
+    ruleList = list(ruleSet)
+    writeLocs = [list(rule.writeLocs) for rule in ruleList]
+
+    # a loc contains another one if they are in the same namespace and its
+    # path as a container is a prefix of the other's path as a containee
+    tries = dict()
+    containees = []
+    for ruleIndex, locs in enumerate(writeLocs):
+      for locIndex, loc in enumerate(locs):
+        namespace, asContainer, asContained = loc.containmentKey
+        tries.setdefault(namespace, _PathTrie()).insert(asContainer,
+            (ruleIndex, locIndex))
+        containees.append((namespace, asContained, (ruleIndex, locIndex)))
+
+    overlaps = set()
+    for namespace, asContained, containee in containees:
+      for container in tries[namespace].valuesAlong(asContained):
+        if container[0] != containee[0]:
+          overlaps.add((min(container, containee), max(container, containee)))
+
+    errorsList = ErrorsList()
+    for (ruleIndex1, locIndex1), (ruleIndex2, locIndex2) in sorted(overlaps,
+        key=lambda overlap: (overlap[0][0], overlap[1][0], overlap[0][1],
+          overlap[1][1])):
+      errorsList.add(formatLoc(writeLocs[ruleIndex1][locIndex1]) + ", " +
+          formatLoc(writeLocs[ruleIndex2][locIndex2]) + ": overlapping writes",
+          ruleList[ruleIndex1], ruleList[ruleIndex2])
+    return errorsList.errors
 
 class NoSourceDirOverwriteValidator(DiscreteValidator):
   def checkRule(self, rule, ruleSet, errors):
@@ -23,13 +23,18 @@ from sibt.domain.optioninfo import OptionInfo
 from sibt.infrastructure import types
 from sibt.domain.execution import Execution
 from sibt.domain.ruleset import RuleSet
+from sibt.domain.logretentionpolicy import LogRetentionPolicy
 
 LocCheckLevel = Enum("None", "Default", "Strict")
 
 AvailableOptions = [
     OptionInfo("LocCheckLevel", LocCheckLevel),
     OptionInfo("AllowedForUsers", types.String),
-    OptionInfo("MustBeMountPoint", types.String)]
+    OptionInfo("MustBeMountPoint", types.String),
+    OptionInfo("KeepLogs", types.Positive),
+    OptionInfo("KeepLogsFor", types.TimeDelta),
+    OptionInfo("KeepFailedLogsFor", types.TimeDelta),
+    OptionInfo("CompactLogs", types.Bool)]
 
 class SyncRule(object):
   def __init__(self, name, options, schedulerOptions, synchronizerOptions, 
@@ -66,13 +71,17 @@ class SyncRule(object):
 
   @property
   def scheduling(self):
-    return Scheduling(self.name, self.schedulerOptions, self.lastExecutionTime)
+    return Scheduling(self.name, self.schedulerOptions, self.lastExecutionTime,
+        tuple(self.writeLocs))
+
+  def forgetCachedExecutions(self):
+    self._cachedExecutions = None
 
   @property
   def _executions(self):
     if self._cachedExecutions is None:
-      self._cachedExecutions = self.log.executionsOfRules(
-          [self.name])[self.name]
+      self._cachedExecutions = self.log.latestExecutionsOfRules(
+          [self.name], 2)[self.name]
     return self._cachedExecutions
 
   @property
@@ -125,7 +134,7 @@ class SyncRule(object):
 
     self.synchronizer.sync(self.synchronizerOptions)
 
-  def execute(self, execEnv, clock, mutexManager):
+  def execute(self, execEnv, clock, mutexManager, errorLogger):
     syncCallSucceeded = [False]
     def makeSchedulerExecute(logger):
       newExecEnv = execEnv.withLoggerReplaced(logger)
@@ -133,11 +142,25 @@ class SyncRule(object):
       syncCallSucceeded[0] = succeeded
       return succeeded
 
+    retentionPolicy = LogRetentionPolicy.fromRuleOptions(self.options)
     with mutexManager.lockForId(self.name):
-      self.log.logExecution(self.name, clock, makeSchedulerExecute)
+      try:
+        self.log.logExecution(self.name, clock, makeSchedulerExecute)
+        if retentionPolicy.expiresAnything:
+          self._removeExpiredExecutions(retentionPolicy, clock, errorLogger)
+      finally:
+        self.forgetCachedExecutions()
 
     return syncCallSucceeded[0]
 
+  def _removeExpiredExecutions(self, retentionPolicy, clock, errorLogger):
+    try:
+      self.log.removeExpiredExecutions(self.name, retentionPolicy,
+          clock.now())
+    except Exception as ex:
+      errorLogger.log("removing expired logs of ‘{0}’ failed: {1}",
+          self.name, str(ex))
+
   def versionsOf(self, location, unstablePhaseDetector):
     locNumber = self._getLocNumber(location)
     if locNumber is None:
@@ -16,6 +16,7 @@
 
 import subprocess
 from sibt.infrastructure.exceptions import ExternalFailureException
+from sibt.infrastructure.coprocessserver import CoprocessServer
 
 ChunkSize = 2048
 Nop = lambda *args: None
@@ -52,6 +53,11 @@ class CoprocessRunner(object):
     with spawnProcess(program, arguments, self.afterForking) as process:
       waitAndCheckExitStatus(process, program, arguments, self.afterWaiting)
 
+  def startServer(self, program, *arguments):
+    ret = CoprocessServer(program, arguments, self.afterForking, 
+        self.afterWaiting)
+    return ret if ret.alive else None
+
   class OutputIterator(object):
     def __init__(self, programPath, arguments, process, delimiter, 
         afterWaiting):
@@ -0,0 +1,105 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import subprocess
+import tempfile
+import os
+from sibt.infrastructure.exceptions import ExternalFailureException
+
+ServeAction = "serve"
+ReadyMessage = b"ready"
+FieldSeparator = b"\0"
+
+def _encode(string):
+  return string.encode(errors="surrogateescape")
+def _decode(bytesObj):
+  return bytesObj.decode(errors="surrogateescape")
+
+def splitOutput(output, delimiter):
+  ret = output.split(delimiter)
+  if ret[-1] == b"":
+    ret.pop()
+  return [_decode(field) for field in ret]
+
+class CoprocessServer(object):
+  def __init__(self, program, arguments, afterForking, afterWaiting):
+    self.program = program
+    self.arguments = list(arguments)
+    self.afterForking = afterForking
+    self.afterWaiting = afterWaiting
+
+    responseFd, self.responseFilePath = tempfile.mkstemp(
+        prefix="sibt-coprocess-response")
+    os.close(responseFd)
+
+    self.process = subprocess.Popen([program] + self.arguments +
+        [ServeAction, self.responseFilePath],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    self.alive = self._readField() == ReadyMessage
+    if not self.alive:
+      self.close()
+
+  def _readField(self):
+    ret = b""
+    while True:
+      char = self.process.stdout.read(1)
+      if char == b"":
+        return None
+      if char == FieldSeparator:
+        return ret
+      ret += char
+
+  def _sendRequest(self, arguments):
+    fields = [str(len(arguments))] + list(arguments)
+    self.process.stdin.write(b"".join(_encode(field) + FieldSeparator for
+      field in fields))
+    self.process.stdin.flush()
+
+  def _exchange(self, arguments):
+    try:
+      self._sendRequest(arguments)
+    except BrokenPipeError:
+      pass
+    statusField = self._readField()
+
+    if statusField is None:
+      self.close()
+      return self.process.returncode
+    return int(statusField)
+
+  def getOutput(self, *arguments, delimiter="\n"):
+    assert ord(delimiter) < 128
+    self.afterForking()
+    exitStatus = self._exchange(arguments)
+    self.afterWaiting(exitStatus)
+
+    if exitStatus != 0:
+      raise ExternalFailureException(self.program,
+          self.arguments + list(arguments), exitStatus)
+
+    with open(self.responseFilePath, "rb") as responseFile:
+      return splitOutput(responseFile.read(), delimiter.encode("utf-8"))
+
+  def close(self):
+    self.alive = False
+    try:
+      self.process.stdin.close()
+    except BrokenPipeError:
+      pass
+    with self.process:
+      pass
+    if os.path.isfile(self.responseFilePath):
+      os.remove(self.responseFilePath)
@@ -32,6 +32,9 @@ class DirTreeNormalizer(object):
         self.paths.enabledDir,
         self.paths.varDir,
         self.paths.logDir,
-        self.paths.lockDir]:
+        self.paths.lockDir,
+        self.paths.synchronizersCacheDir,
+        self.paths.rulesCacheDir,
+        self.paths.checksCacheDir]:
       self._createIfDoesntExist(path)
 
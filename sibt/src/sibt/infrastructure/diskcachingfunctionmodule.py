@@ -0,0 +1,160 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from sibt.infrastructure.exceptions import \
+    ModuleFunctionNotImplementedException
+
+CachedFunctions = ["describe", "available-options", "info-of-port"]
+TimedFunctions = ["check"]
+DefaultTimedEntriesTTLInS = 60
+
+def fingerprintOf(paths):
+  ret = []
+  for path in paths:
+    with open(path, "rb") as fileToHash:
+      stat = os.fstat(fileToHash.fileno())
+      digest = hashlib.sha256(fileToHash.read()).hexdigest()
+    ret.append([path, stat.st_size, stat.st_mtime_ns, digest])
+  return ret
+
+def _statsOfLocalLocs(options):
+  ret = []
+  for key in sorted(options.keys()):
+    if not key.endswith("Protocol") or options[key] != "file":
+      continue
+    path = options.get(key[:-len("Protocol")] + "Path")
+    try:
+      stat = os.stat(path)
+      ret.append([path, stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns])
+    except (OSError, TypeError):
+      ret.append([path, None, None, None])
+  return ret
+
+class DiskCachingFunctionModule(object):
+  def __init__(self, wrapped, cacheFilePath, dependencyPaths,
+      timedEntriesTTLInS=DefaultTimedEntriesTTLInS, currentTime=time.time,
+      reuseTimedEntries=True):
+    self._wrapped = wrapped
+    self.cacheFilePath = cacheFilePath
+    self.dependencyPaths = list(dependencyPaths)
+    self.timedEntriesTTLInS = timedEntriesTTLInS
+    self._currentTime = currentTime
+    self.reuseTimedEntries = reuseTimedEntries
+    self._fingerprint = None
+    self._entries = None
+    self._lock = threading.Lock()
+
+  def callFuzzy(self, funcName, positionalArgs, options):
+    if funcName not in CachedFunctions or len(options) > 0:
+      return self._wrapped.callFuzzy(funcName, positionalArgs, options)
+
+    with self._lock:
+      entries = self._getEntries()
+      key = "\0".join([funcName] + list(positionalArgs))
+      if entries is not None and key not in entries:
+        entries[key] = self._callUncached(funcName, positionalArgs)
+        self._save()
+      entry = entries[key] if entries is not None else \
+          self._callUncached(funcName, positionalArgs)
+
+    if entry["notImplemented"]:
+      raise ModuleFunctionNotImplementedException(funcName)
+    return list(entry["output"])
+
+  def callExact(self, funcName, positionalArgs, options):
+    if funcName not in TimedFunctions:
+      return self._wrapped.callExact(funcName, positionalArgs, options)
+
+    key = json.dumps([funcName, list(positionalArgs), sorted(options.items()),
+      _statsOfLocalLocs(options)])
+    with self._lock:
+      entries = self._getEntries()
+      entry = entries.get(key) if entries is not None else None
+    if entry is None or not self.reuseTimedEntries or not (0 <= 
+        self._currentTime() - entry["time"] < self.timedEntriesTTLInS):
+      entry = self._callUncached(funcName, positionalArgs, options,
+          self._wrapped.callExact)
+      entry["time"] = self._currentTime()
+      with self._lock:
+        if entries is not None:
+          self._removeExpiredEntries(entries)
+          entries[key] = entry
+          self._save()
+
+    if entry["notImplemented"]:
+      raise ModuleFunctionNotImplementedException(funcName)
+    return list(entry["output"])
+
+  def _removeExpiredEntries(self, entries):
+    now = self._currentTime()
+    for key in [key for key, entry in entries.items() if "time" in entry and
+        not 0 <= now - entry["time"] < self.timedEntriesTTLInS]:
+      del entries[key]
+
+  def _callUncached(self, funcName, positionalArgs, options=dict(),
+      func=None):
+    try:
+      return dict(notImplemented=False, output=list((func or
+        self._wrapped.callFuzzy)(funcName, positionalArgs, options)))
+    except ModuleFunctionNotImplementedException:
+      return dict(notImplemented=True, output=[])
+
+  def _getEntries(self):
+    if self._entries is None:
+      try:
+        self._fingerprint = fingerprintOf(self.dependencyPaths)
+      except OSError:
+        return None
+      self._entries = self._load()
+    return self._entries
+
+  def _load(self):
+    try:
+      with open(self.cacheFilePath, "r") as cacheFile:
+        cache = json.load(cacheFile)
+      if cache["fingerprint"] == self._fingerprint:
+        return dict(cache["entries"])
+    except (OSError, ValueError, KeyError, TypeError):
+      pass
+    return dict()
+
+  def _save(self):
+    try:
+      if fingerprintOf(self.dependencyPaths) != self._fingerprint:
+        return
+      cacheDir = os.path.dirname(self.cacheFilePath)
+      os.makedirs(cacheDir, exist_ok=True)
+
+      fd, tempPath = tempfile.mkstemp(dir=cacheDir, prefix=".")
+      try:
+        with os.fdopen(fd, "w") as tempFile:
+          json.dump(dict(fingerprint=self._fingerprint,
+            entries=self._entries), tempFile)
+        os.replace(tempPath, self.cacheFilePath)
+      except:
+        os.remove(tempPath)
+        raise
+    except OSError:
+      pass
+
+  def __getattr__(self, name):
+    return getattr(self._wrapped, name)
@@ -25,6 +25,11 @@ def writeLock(lockFile):
 def readLock(lockFile):
   _lock(lockFile, fcntl.LOCK_SH)
 
+def waitForWriteLock(lockFile):
+  fcntl.lockf(lockFile, fcntl.LOCK_EX)
+def unlock(lockFile):
+  fcntl.lockf(lockFile, fcntl.LOCK_UN)
+
 def _lock(lockFile, lockType):
   fcntl.lockf(lockFile, lockType | fcntl.LOCK_NB)
 
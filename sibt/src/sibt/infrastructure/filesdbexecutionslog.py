@@ -15,13 +15,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import gzip
 import struct
+import tempfile
 from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
 import traceback
 
 from sibt.domain.execution import Execution, ExecutionResult
 from sibt.infrastructure.linebufferedlogger import LineBufferedLogger
-from sibt.infrastructure.fcntlmutexmanager import tryToLock, readLock, writeLock
+from sibt.infrastructure.fcntlmutexmanager import tryToLock, readLock, \
+    writeLock, waitForWriteLock, unlock
 
 TimeFormat = "%Y-%m-%dT%H:%M:%S.%f%z"
 Encoding = "utf-8"
@@ -31,6 +35,8 @@ SeekEnd = 2
 BigEndian32BitUInt = ">I"
 UnsetLength = b"\xFF\xFF\xFF\xFF"
 LargerThanHeaderOrFooter = 2**12
+IndexFileName = "index"
+Epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 class _LogFileLogger(LineBufferedLogger):
   def __init__(self, file):
@@ -46,6 +52,77 @@ def _encode(string):
 def _decode(bytesObject):
   return bytesObject.decode(Encoding)
 
+def _parseTime(line):
+  return datetime.strptime(_decode(line[:-1]), TimeFormat)
+
+def _toMicroseconds(dateTime):
+  if dateTime is None:
+    return 0, 0
+  return (dateTime - Epoch) // timedelta(microseconds=1), \
+      int(dateTime.utcoffset().total_seconds())
+
+def _fromMicroseconds(microseconds, utcOffset):
+  return (Epoch + timedelta(microseconds=microseconds)).astimezone(
+      timezone(timedelta(seconds=utcOffset)))
+
+class _IndexRecord(object):
+  Format = struct.Struct(">IqiqiBIQI")
+  Running, Failed, Succeeded = range(3)
+
+  def __init__(self, number, startTime, endTime, succeeded, outputOffset,
+      outputLength, segment=0):
+    self.number = number
+    self.startTime = startTime
+    self.endTime = endTime
+    self.succeeded = succeeded
+    self.outputOffset = outputOffset
+    self.outputLength = outputLength
+    self.segment = segment
+
+  @property
+  def finished(self):
+    return self.endTime is not None
+
+  def pack(self):
+    state = _IndexRecord.Running if not self.finished else (
+        _IndexRecord.Succeeded if self.succeeded else _IndexRecord.Failed)
+    return _IndexRecord.Format.pack(self.number,
+        *_toMicroseconds(self.startTime), *_toMicroseconds(self.endTime),
+        state, self.segment, self.outputOffset, self.outputLength)
+
+  @classmethod
+  def unpack(clazz, data):
+    number, startMicroseconds, startOffset, endMicroseconds, endOffset, \
+        state, segment, outputOffset, outputLength = clazz.Format.unpack(data)
+    return clazz(number, _fromMicroseconds(startMicroseconds, startOffset),
+        None if state == clazz.Running else
+          _fromMicroseconds(endMicroseconds, endOffset),
+        state == clazz.Succeeded, outputOffset, outputLength, segment)
+
+def _readIndexRecords(indexFile, count):
+  recordSize = _IndexRecord.Format.size
+  numberOfRecords = indexFile.seek(0, SeekEnd) // recordSize
+  firstRecord = 0 if count is None else max(0, numberOfRecords - count)
+
+  indexFile.seek(firstRecord * recordSize, SeekSet)
+  data = indexFile.read((numberOfRecords - firstRecord) * recordSize)
+  return [_IndexRecord.unpack(data[i:i + recordSize]) for i in
+      range(0, len(data), recordSize)]
+
+def _segmentOf(record):
+  return record.startTime.year * 100 + record.startTime.month
+
+def _segmentFileName(segment):
+  return "{0:04d}-{1:02d}.gz".format(segment // 100, segment % 100)
+
+@contextmanager
+def _exclusivelyLocked(file):
+  waitForWriteLock(file)
+  try:
+    yield
+  finally:
+    unlock(file)
+
 def _callCatchingExceptions(logFile, execute, succeeded):
   try:
     succeeded[0] = execute(logFile)
@@ -82,42 +159,93 @@ class FilesDBExecutionsLog(object):
     return not couldLock
 
   def executionsOfRules(self, ruleNames):
-    return dict((ruleName, self._executionsOfRule(
-      self._storageName(ruleName))) for ruleName in ruleNames)
+    return self.latestExecutionsOfRules(ruleNames, None)
 
-  def _executionsOfRule(self, ruleName):
-    folderPath, loggingFileNames = self._readLogFolder(ruleName, create=False)
-    return [self._readLoggingFile(os.path.join(folderPath, fileName)) for 
-        fileName in loggingFileNames]
+  def latestExecutionsOfRules(self, ruleNames, count):
+    return dict((ruleName, self._executionsOfRule(
+      self._storageName(ruleName), count)) for ruleName in ruleNames)
 
-  def _readLoggingFile(self, filePath):
+  def _executionsOfRule(self, ruleName, count):
+    folderPath = os.path.join(self.logDir, ruleName)
+    try:
+      with open(os.path.join(folderPath, IndexFileName), "rb") as indexFile:
+        records = _readIndexRecords(indexFile, count)
+    except FileNotFoundError:
+      records = self._indexRecordsOfLoggingFiles(folderPath, count)
+
+    return [self._readExecution(folderPath, record) for record in records]
+
+  def _indexRecordsOfLoggingFiles(self, folderPath, count):
+    loggingFileNames = self._loggingFileNames(folderPath)
+    if count is not None:
+      loggingFileNames = loggingFileNames[-count:]
+    return [self._readIndexRecord(int(fileName), 
+      os.path.join(folderPath, fileName)) for fileName in loggingFileNames]
+
+  @contextmanager
+  def _openLoggingFile(self, filePath):
     file = open(filePath, "rb", buffering=LargerThanHeaderOrFooter)
     try:
-      return self._parseLoggingFile(file, filePath)
+      yield file
     finally:
       if filePath in self._lockedPaths:
         self._filesToClose.append(file)
       else:
         file.close()
 
-  def _parseLoggingFile(self, file, filePath):
-    startTime = datetime.strptime(_decode(file.readline()[:-1]), TimeFormat)
-    lengthField = file.read(4)
+  def _readIndexRecord(self, number, filePath):
+    with self._openLoggingFile(filePath) as file:
+      startTime = _parseTime(file.readline())
+      lengthField = file.read(4)
+      outputOffset = file.tell()
 
-    if lengthField == UnsetLength:
-      output = self._readTextUntilEnd(file)
-      result = None
-      if not self._isLocked(filePath):
-        output += "\nError: Log entry could not be finished (crashed?)"
-        result = ExecutionResult(startTime + timedelta(hours=2), False)
-    else:
-      output = self._readTextOfLength(file, lengthField)
-      endTime = datetime.strptime(_decode(file.readline()[:-1]), TimeFormat)
+      if lengthField == UnsetLength:
+        return _IndexRecord(number, startTime, None, False, outputOffset, 0)
+
+      outputLength = struct.unpack(BigEndian32BitUInt, lengthField)[0]
+      file.seek(outputLength + 1, SeekCur)
+      endTime = _parseTime(file.readline())
       succeeded = file.readline()[:-1] == b"True"
+      return _IndexRecord(number, startTime, endTime, succeeded, outputOffset,
+          outputLength)
+
+  def _readExecution(self, folderPath, record):
+    if record.segment != 0:
+      archivePath = os.path.join(folderPath, _segmentFileName(record.segment))
+      return Execution(record.startTime,
+          lambda: self._readArchivedOutput(archivePath, record),
+          ExecutionResult(record.endTime, record.succeeded))
+
+    filePath = os.path.join(folderPath, str(record.number))
+    if not record.finished:
+      record = self._readIndexRecord(record.number, filePath)
+
+    if record.finished:
+      return Execution(record.startTime,
+          lambda: self._readOutput(filePath, record),
+          ExecutionResult(record.endTime, record.succeeded))
+
+    with self._openLoggingFile(filePath) as file:
+      file.seek(record.outputOffset, SeekSet)
+      output = self._readTextUntilEnd(file)
+
+    result = None
+    if not self._isLocked(filePath):
+      output += "\nError: Log entry could not be finished (crashed?)"
+      result = ExecutionResult(record.startTime + timedelta(hours=2), False)
+    return Execution(record.startTime, output, result)
+
+  def _readOutput(self, filePath, record):
+    return _decode(self._readOutputBytes(filePath, record))
 
-      result = ExecutionResult(endTime, succeeded)
+  def _readOutputBytes(self, filePath, record):
+    with self._openLoggingFile(filePath) as file:
+      return os.pread(file.fileno(), record.outputLength, record.outputOffset)
 
-    return Execution(startTime, output, result)
+  def _readArchivedOutput(self, archivePath, record):
+    with open(archivePath, "rb") as archive:
+      return _decode(gzip.decompress(os.pread(archive.fileno(),
+        record.outputLength, record.outputOffset)))
 
   def _readTextUntilEnd(self, file):
     currentPosition = file.tell()
@@ -125,45 +253,128 @@ class FilesDBExecutionsLog(object):
     file.seek(currentPosition, SeekSet)
     return _decode(file.read(outputLength))
 
-  def _readTextOfLength(self, file, lengthBytes):
-    outputLength = struct.unpack(BigEndian32BitUInt, lengthBytes)[0]
-    ret = _decode(file.read(outputLength))
-    file.readline()
-    return ret
-
 
   def logExecution(self, ruleName, clock, writeSchedulingOutput):
-    folderPath, loggingFileNames = self._readLogFolder(
-        self._storageName(ruleName), create=True)
-    latestLoggingNumber = 0 if len(loggingFileNames) == 0 else \
-        int(loggingFileNames[-1])
-
-    self._writeLoggingFile(
-        os.path.join(folderPath, str(latestLoggingNumber + 1)), 
-        clock, writeSchedulingOutput)
-
-  def _writeLoggingFile(self, filePath, clock, writeExecutionOutput):
-    with open(filePath, "wb") as file:
-      self._lock(file, filePath)
-      textLengthFieldPos = self._writeHeader(file, clock.now())
+    folderPath = os.path.join(self.logDir, self._storageName(ruleName))
+    if not os.path.isdir(folderPath):
+      os.mkdir(folderPath)
+
+    indexFd = os.open(os.path.join(folderPath, IndexFileName),
+        os.O_RDWR | os.O_CREAT, 0o666)
+    with open(indexFd, "r+b", buffering=0) as indexFile:
+      startTime = clock.now()
+      with _exclusivelyLocked(indexFile):
+        number = self._nextLoggingNumber(folderPath, indexFile)
+        filePath = os.path.join(folderPath, str(number))
+        file = open(filePath, "wb")
+        try:
+          self._lock(file, filePath)
+          textLengthFieldPos = self._writeHeader(file, startTime)
+          file.flush()
+
+          record = _IndexRecord(number, startTime, None, False,
+              textLengthFieldPos + 4, 0)
+          recordPos = indexFile.seek(0, SeekEnd)
+          indexFile.write(record.pack())
+        except:
+          file.close()
+          self._lockedPaths.discard(filePath)
+          raise
+
+      with file:
+        self._writeLoggingFile(file, filePath, textLengthFieldPos, clock,
+            writeSchedulingOutput, indexFile, record, recordPos)
+
+  def _nextLoggingNumber(self, folderPath, indexFile):
+    latestRecords = _readIndexRecords(indexFile, 1)
+    if len(latestRecords) == 0:
+      latestRecords = self._indexRecordsOfLoggingFiles(folderPath, None)
+      indexFile.write(b"".join(record.pack() for record in latestRecords))
+
+    return 1 if len(latestRecords) == 0 else latestRecords[-1].number + 1
+
+  def _writeLoggingFile(self, file, filePath, textLengthFieldPos, clock,
+      writeExecutionOutput, indexFile, record, recordPos):
+    executionSucceeded = [None]
+    logger = _LogFileLogger(file)
+    try:
+      _callCatchingExceptions(logger, writeExecutionOutput, 
+          executionSucceeded)
+    finally:
+      logger.close()
+      textLength = file.tell() - textLengthFieldPos - 4
+
+      file.seek(textLengthFieldPos, SeekSet)
+      file.write(struct.pack(BigEndian32BitUInt, textLength))
+      file.seek(0, SeekEnd)
+
+      record.endTime = clock.now()
+      record.succeeded = executionSucceeded[0] is True
+      record.outputLength = textLength
+      self._writeFooter(file, record.endTime, record.succeeded)
       file.flush()
+      os.pwrite(indexFile.fileno(), record.pack(), recordPos)
+
+      self._closeFiles()
+      self._lockedPaths.remove(filePath)
 
-      executionSucceeded = [None]
-      logger = _LogFileLogger(file)
+  def removeExpiredExecutions(self, ruleName, retentionPolicy, now):
+    folderPath = os.path.join(self.logDir, self._storageName(ruleName))
+    try:
+      indexFile = open(os.path.join(folderPath, IndexFileName), "r+b",
+          buffering=0)
+    except FileNotFoundError:
+      return
+
+    with indexFile, _exclusivelyLocked(indexFile):
+      records = _readIndexRecords(indexFile, None)
+      keptRecords = []
+      removedPaths = []
+
+      for i, record in enumerate(records):
+        filePath = os.path.join(folderPath, str(record.number))
+        if record.segment != 0 or not retentionPolicy.isExpired(record,
+            len(records) - i - 1, now) or self._isLocked(filePath):
+          keptRecords.append(record)
+          continue
+
+        removedPaths.append(filePath)
+        if retentionPolicy.compact:
+          keptRecords.append(self._archive(folderPath, filePath, record))
+
+      if len(removedPaths) == 0:
+        return
+      self._replaceIndex(folderPath, keptRecords,
+          os.fstat(indexFile.fileno()).st_mode & 0o777)
+
+    for removedPath in removedPaths:
       try:
-        _callCatchingExceptions(logger, writeExecutionOutput, 
-            executionSucceeded)
-      finally:
-        logger.close()
-        textLength = file.tell() - textLengthFieldPos - 4
+        os.remove(removedPath)
+      except FileNotFoundError:
+        pass
 
-        file.seek(textLengthFieldPos, SeekSet)
-        file.write(struct.pack(BigEndian32BitUInt, textLength))
-        file.seek(0, SeekEnd)
+  def _archive(self, folderPath, filePath, record):
+    segment = _segmentOf(record)
+    compressedOutput = gzip.compress(self._readOutputBytes(filePath, record))
 
-        self._writeFooter(file, clock.now(), executionSucceeded[0] is True)
-        self._closeFiles()
-        self._lockedPaths.remove(filePath)
+    with open(os.path.join(folderPath, _segmentFileName(segment)),
+        "ab") as archive:
+      offset = archive.seek(0, SeekEnd)
+      archive.write(compressedOutput)
+
+    return _IndexRecord(record.number, record.startTime, record.endTime,
+        record.succeeded, offset, len(compressedOutput), segment)
+
+  def _replaceIndex(self, folderPath, records, mode):
+    fd, tempPath = tempfile.mkstemp(dir=folderPath, prefix=".")
+    try:
+      os.fchmod(fd, mode)
+      with os.fdopen(fd, "wb") as tempFile:
+        tempFile.write(b"".join(record.pack() for record in records))
+      os.replace(tempPath, os.path.join(folderPath, IndexFileName))
+    except:
+      os.remove(tempPath)
+      raise
 
   def _writeHeader(self, file, startTime):
     file.write(_encode(startTime.strftime(TimeFormat)))
@@ -180,17 +391,11 @@ class FilesDBExecutionsLog(object):
     file.write(b"True" if succeeded else b"False")
     file.write(b"\n")
 
-  def _readLogFolder(self, ruleName, create):
-    folderPath = os.path.join(self.logDir, ruleName)
-
+  def _loggingFileNames(self, folderPath):
     if not os.path.isdir(folderPath):
-      if not create:
-        return folderPath, []
-      os.mkdir(folderPath)
-
-    loggingFileNames = sorted(os.listdir(folderPath),
-        key=lambda fileName: int(fileName))
-    return folderPath, loggingFileNames
+      return []
+    return sorted((fileName for fileName in os.listdir(folderPath) if
+      fileName.isdigit()), key=lambda fileName: int(fileName))
 
   def _storageName(self, ruleName):
     return ruleName[len(self.ruleNamePrefix):]
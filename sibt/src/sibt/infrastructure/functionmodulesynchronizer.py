@@ -26,12 +26,40 @@ from sibt.domain.port import Port
 from sibt.infrastructure.optioninfoparser import OptionInfoParser
 
 TimeFormat = re.compile(r"^[0-9]+(,[0-9]{1,3})?$")
+SectionHeader = re.compile(r"^\[([a-z-]+)\]$")
+
+class _Description(object):
+  def __init__(self):
+    self.options = None
+    self.portInfos = []
+    self.specials = None
+
+def parseDescription(lines):
+  ret = _Description()
+  currentSection = None
+
+  for line in lines:
+    match = SectionHeader.match(line)
+    if match is not None:
+      currentSection = []
+      sectionName = match.group(1)
+      if sectionName == "options":
+        ret.options = currentSection
+      elif sectionName == "port":
+        ret.portInfos.append(currentSection)
+      elif sectionName == "specials":
+        ret.specials = currentSection
+    elif currentSection is not None:
+      currentSection.append(line)
+
+  return ret
 
 class FunctionModuleSynchronizer(object):
   def __init__(self, functions, name):
     self.functions = functions
     self.name = name
     self.formatter = FunctionModuleSynchronizer.TypedValuesFormatter()
+    self._description = None
 
   def sync(self, options):
     self._callFunction(self.functions.callVoid, "sync", options)
@@ -50,8 +78,8 @@ class FunctionModuleSynchronizer(object):
 
   def listFiles(self, options, visitorFunc, path, locNumber, version, 
       recursively):
-    output = self._callFunction(self.functions.callExact, "list-files", 
-        options, path, str(locNumber), version, recursively)
+    output = self._callFunction(self.functions.callExactStreaming,
+        "list-files", options, path, str(locNumber), version, recursively)
     for fileName in output:
       visitorFunc(fileName)
 
@@ -60,9 +88,18 @@ class FunctionModuleSynchronizer(object):
 
   @property
   def availableOptions(self):
+    description = self._getDescription()
+    if description is None:
+      optionStrings = self._callFunction(self.functions.callFuzzy, 
+          "available-options")
+    elif description.options is None:
+      raise SynchronizerFuncNotImplementedException(self.name, 
+          "available-options")
+    else:
+      optionStrings = description.options
+
     parser = OptionInfoParser()
-    return [parser.parse(optionString) for optionString in \
-        self._callFunction(self.functions.callFuzzy, "available-options")]
+    return [parser.parse(optionString) for optionString in optionStrings]
 
   @property
   def ports(self):
@@ -71,14 +108,36 @@ class FunctionModuleSynchronizer(object):
         yield self._callFunction(self.functions.callFuzzy, 
             "info-of-port", {}, i)
 
-    infos = itertools.takewhile(lambda output: len(output) > 0, 
-        lazyPortsOutput())
+    description = self._getDescription()
+    if description is None:
+      infos = itertools.takewhile(lambda output: len(output) > 0, 
+          lazyPortsOutput())
+    elif len(description.portInfos) == 0:
+      raise SynchronizerFuncNotImplementedException(self.name, "info-of-port")
+    else:
+      infos = description.portInfos
+
     return [Port(info[1:], info[0] == "1") for info in infos]
 
   @property
   def onePortMustHaveFileProtocol(self):
-    return "one-must-be-file" in self._callFunction(self.functions.callFuzzy,
-        "info-of-port", {}, "specials")
+    description = self._getDescription()
+    if description is None:
+      specials = self._callFunction(self.functions.callFuzzy, 
+          "info-of-port", {}, "specials")
+    else:
+      specials = description.specials or []
+
+    return "one-must-be-file" in specials
+
+  def _getDescription(self):
+    if self._description is None:
+      try:
+        self._description = parseDescription(self._callFunction(
+          self.functions.callFuzzy, "describe"))
+      except SynchronizerFuncNotImplementedException:
+        self._description = False
+    return self._description or None
 
   def _callFunction(self, func, funcName, options=dict(), *positionalArgs):
     try:
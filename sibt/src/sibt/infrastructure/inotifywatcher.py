@@ -0,0 +1,149 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import errno
+import collections
+import struct
+import select
+import ctypes
+import ctypes.util
+
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_MASK_ADD = 0x20000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+DirMask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | \
+    IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | \
+    IN_ONLYDIR | IN_MASK_ADD
+ParentMask = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR | IN_MASK_ADD
+
+EventHeader = struct.Struct("iIII")
+
+_libc = None
+def _loadLibc():
+  global _libc
+  if _libc is None:
+    libcName = ctypes.util.find_library("c")
+    if libcName is None:
+      raise OSError(errno.ENOSYS, "libc not found")
+    libc = ctypes.CDLL(libcName, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+      raise OSError(errno.ENOSYS, "inotify is not available")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+        ctypes.c_uint32]
+    _libc = libc
+  return _libc
+
+def _checked(ret):
+  if ret < 0:
+    errorNumber = ctypes.get_errno()
+    raise OSError(errorNumber, os.strerror(errorNumber))
+  return ret
+
+class InotifyWatcher(object):
+  def __init__(self, dirs):
+    self._libc = _loadLibc()
+    self._fd = _checked(self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+    self.dirs = [os.path.abspath(directory) for directory in dirs]
+    self._watchedDirs = dict()
+    self._watchedParents = dict()
+    for directory in self.dirs:
+      self._watch(directory)
+
+  def fileno(self):
+    return self._fd
+
+  def close(self):
+    if self._fd is not None:
+      os.close(self._fd)
+      self._fd = None
+
+  def waitForChanges(self, timeout=None):
+    ready, _, _ = select.select([self._fd], [], [], timeout)
+    if len(ready) == 0:
+      return []
+    return self.readChanges()
+
+  def readChanges(self):
+    ret = []
+    while True:
+      try:
+        buffer = os.read(self._fd, 64 * 1024)
+      except BlockingIOError:
+        return list(collections.OrderedDict.fromkeys(ret))
+
+      offset = 0
+      while offset < len(buffer):
+        watchDescriptor, mask, _, nameLength = EventHeader.unpack_from(buffer,
+            offset)
+        offset += EventHeader.size
+        name = buffer[offset:offset + nameLength].rstrip(b"\0")
+        offset += nameLength
+        ret.extend(self._handleEvent(watchDescriptor, mask, os.fsdecode(name)))
+
+  def _handleEvent(self, watchDescriptor, mask, name):
+    if mask & IN_Q_OVERFLOW:
+      return [(directory, None) for directory in self.dirs]
+
+    ret = []
+    if mask & (IN_CREATE | IN_MOVED_TO):
+      for directory in self._watchedParents.get(watchDescriptor, []):
+        if os.path.basename(directory) == name:
+          self._watch(directory)
+          ret.append((directory, None))
+
+    directories = self._watchedDirs.get(watchDescriptor, [])
+    if mask & IN_IGNORED:
+      self._watchedDirs.pop(watchDescriptor, None)
+      self._watchedParents.pop(watchDescriptor, None)
+      for directory in directories:
+        self._watch(directory)
+    if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+      return ret + [(directory, None) for directory in directories]
+    return ret + [(directory, name) for directory in directories]
+
+  def _watch(self, directory):
+    path = os.fsencode(directory)
+    watchDescriptor = self._libc.inotify_add_watch(self._fd, path, DirMask)
+    if watchDescriptor >= 0:
+      self._addTo(self._watchedDirs, watchDescriptor, directory)
+      return
+
+    parent = os.path.dirname(directory)
+    if parent != directory:
+      watchDescriptor = self._libc.inotify_add_watch(self._fd,
+          os.fsencode(parent), ParentMask)
+      if watchDescriptor >= 0:
+        self._addTo(self._watchedParents, watchDescriptor, directory)
+
+  def _addTo(self, watches, watchDescriptor, directory):
+    directories = watches.setdefault(watchDescriptor, [])
+    if directory not in directories:
+      directories.append(directory)
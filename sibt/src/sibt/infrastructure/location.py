@@ -30,6 +30,20 @@ _EquivalenceClassesIfRelative = [
 _EquivalenceClassesIfAbsolute = [
     [*_SshBasedProtocols, "ftp"]]
 
+_resolvedPaths = dict()
+
+def forgetResolvedPaths():
+  _resolvedPaths.clear()
+
+def _resolvedComponents(path, resolveBasename):
+  key = (path, resolveBasename)
+  ret = _resolvedPaths.get(key)
+  if ret is None:
+    ret = tuple(FilePath.fromString(path,
+      forceResolveBasename=resolveBasename).withLinksResolved.components)
+    _resolvedPaths[key] = ret
+  return ret
+
 class RemoteLocation(object):
   def __init__(self, protocol, login, host, port, path):
     self.protocol = protocol
@@ -83,6 +97,17 @@ class RemoteLocation(object):
 
     return ret
 
+  @property
+  def containmentKey(self):
+    equivClasses = _EquivalenceClassesIfAbsolute if \
+        self._filePath.isAbsolute else _EquivalenceClassesIfRelative
+    namespace = (self._filePath.isAbsolute,
+        tuple(_equivalenceClassOf(equivClasses, self.protocol)), self.host)
+    if not self._filePath.isAbsolute:
+      namespace += (self.login, self.port)
+    components = tuple(self._filePath.components)
+    return namespace, components, components
+
   def __str__(self):
     return "{0}://{1}{2}{3}{4}".format(self.protocol,
         self.login + "@" if self.login != "" else "",
@@ -127,11 +152,23 @@ class LocalLocation(object):
     if isinstance(other, RemoteLocation):
       return None
 
-    resolvedPath = FilePath.fromString(other._initialPath).withLinksResolved
-    resolvedContainer = FilePath.fromString(self._initialPath, 
-        forceResolveBasename=True).withLinksResolved
+    resolvedContainer = self._resolvedAsContainer
+    resolvedPath = other._resolvedAsContained
+    if resolvedPath[:len(resolvedContainer)] != resolvedContainer:
+      return None
+    return str(FilePath(list(resolvedPath[len(resolvedContainer):]),
+      isAbsolute=False))
 
-    return resolvedContainer.relativePathTo(resolvedPath)
+  @property
+  def _resolvedAsContainer(self):
+    return _resolvedComponents(self._initialPath, True)
+  @property
+  def _resolvedAsContained(self):
+    return _resolvedComponents(self._initialPath, False)
+
+  @property
+  def containmentKey(self):
+    return ("file",), self._resolvedAsContainer, self._resolvedAsContained
 
   def __str__(self):
     return self.path
@@ -156,6 +193,10 @@ class FilePath(object):
     self.resolveBasename = resolveBasename
     self.isAbsolute = isAbsolute
 
+  @property
+  def components(self):
+    return self._components
+
   @property
   def parent(self):
     return FilePath(self._components[:-1])
@@ -0,0 +1,209 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import errno
+import shlex
+import socket
+import getpass
+from datetime import datetime, timezone
+from sibt.infrastructure.linebufferedlogger import LineBufferedLogger
+from sibt.infrastructure.utillinuxsyslogger import UtilLinuxSysLogger
+
+DefaultSocketPath = "/dev/log"
+DefaultUDPPort = 514
+DefaultTCPPort = 601
+
+Facilities = dict((name, code) for code, names in enumerate([
+  ["kern"], ["user"], ["mail"], ["daemon"], ["auth", "security"], ["syslog"],
+  ["lpr"], ["news"], ["uucp"], ["cron"], ["authpriv"], ["ftp"]]) for
+  name in names)
+Facilities.update(("local{0}".format(i), 16 + i) for i in range(8))
+Severities = dict((name, code) for code, names in enumerate([
+  ["emerg", "panic"], ["alert"], ["crit"], ["err", "error"],
+  ["warning", "warn"], ["notice"], ["info"], ["debug"]]) for name in names)
+
+MonthNames = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep",
+    "Oct", "Nov", "Dec"]
+
+class SyslogTarget(object):
+  def __init__(self):
+    self.socketPath = None
+    self.server = None
+    self.port = None
+    self.protocol = None
+    self.messageFormat = None
+
+  @property
+  def isRemote(self):
+    return self.server is not None
+
+  def connect(self):
+    if not self.isRemote:
+      return self._connectToUnixSocket(self.socketPath or DefaultSocketPath)
+
+    socketType = socket.SOCK_STREAM if self.protocol == "tcp" else \
+        socket.SOCK_DGRAM
+    port = self.port or (DefaultTCPPort if self.protocol == "tcp" else
+        DefaultUDPPort)
+    family, _, proto, _, address = socket.getaddrinfo(self.server, port,
+        type=socketType)[0]
+    ret = socket.socket(family, socketType, proto)
+    try:
+      ret.connect(address)
+    except:
+      ret.close()
+      raise
+    return ret
+
+  def _connectToUnixSocket(self, path):
+    for socketType in [socket.SOCK_DGRAM, socket.SOCK_STREAM]:
+      ret = socket.socket(socket.AF_UNIX, socketType)
+      try:
+        ret.connect(path)
+        return ret
+      except OSError as ex:
+        ret.close()
+        if ex.errno != errno.EPROTOTYPE:
+          raise
+    raise OSError(errno.EPROTOTYPE, os.strerror(errno.EPROTOTYPE), path)
+
+def parseLoggerOptions(loggerOptions):
+  ret = SyslogTarget()
+  args = shlex.split(loggerOptions)
+
+  def takeValue(inlineValue):
+    if inlineValue is not None:
+      return inlineValue
+    if len(args) == 0:
+      raise ValueError()
+    return args.pop(0)
+
+  try:
+    while len(args) > 0:
+      option, separator, inlineValue = args.pop(0).partition("=")
+      inlineValue = inlineValue if separator != "" else None
+
+      if option in ["-d", "--udp"]:
+        ret.protocol = "udp"
+      elif option in ["-T", "--tcp"]:
+        ret.protocol = "tcp"
+      elif option in ["-n", "--server"]:
+        ret.server = takeValue(inlineValue)
+      elif option in ["-P", "--port"]:
+        ret.port = int(takeValue(inlineValue))
+      elif option in ["-u", "--socket"]:
+        ret.socketPath = takeValue(inlineValue)
+      elif option in ["--rfc3164", "--rfc5424"] and inlineValue is None:
+        ret.messageFormat = option[2:]
+      else:
+        return None
+  except ValueError:
+    return None
+
+  if ret.messageFormat is None:
+    ret.messageFormat = "rfc5424" if ret.isRemote else "local"
+  return ret
+
+class NativeSysLogger(LineBufferedLogger):
+  def __init__(self, loggerOptions, prefix=None,
+      facility="user", severity="info", tag=None):
+    super().__init__()
+
+    self.prefix = b""
+    if prefix is not None:
+      self.prefix = prefix + b": "
+
+    self.facility = facility
+    self.severity = severity
+    self.tag = (tag or getpass.getuser()).encode()
+
+    self.fallback = UtilLinuxSysLogger(loggerOptions, prefix=prefix,
+        facility=facility, severity=severity, tag=tag)
+    self.target = parseLoggerOptions(loggerOptions)
+    self.hostName = socket.gethostname().split(".")[0].encode()
+    self._socket = None
+    self._pendingLines = []
+
+  def write(self, chunk, **kwargs):
+    super().write(chunk, **kwargs)
+    self._flush()
+
+  def writeLine(self, line, facility=None, severity=None, **kwargs):
+    self._pendingLines.append((line, facility or self.facility,
+      severity or self.severity))
+
+  def close(self):
+    super().close()
+    self._flush()
+    self._disconnect()
+
+  def _flush(self):
+    lines = self._pendingLines
+    self._pendingLines = []
+
+    if self.target is not None:
+      try:
+        lines = self._send(lines)
+      except (OSError, KeyError):
+        self._disconnect()
+
+    for line, facility, severity in lines:
+      self.fallback.writeLine(line, facility=facility, severity=severity)
+
+  def _send(self, lines):
+    if len(lines) == 0:
+      return lines
+    if self._socket is None:
+      self._socket = self.target.connect()
+
+    now = datetime.now(timezone.utc).astimezone()
+    messages = [self._formatMessage(now, line, facility, severity) for
+        line, facility, severity in lines]
+
+    if self._socket.type == socket.SOCK_STREAM:
+      self._socket.sendall(b"".join(message + b"\n" for message in messages))
+      return []
+
+    for i, message in enumerate(messages):
+      try:
+        self._socket.send(message)
+      except OSError:
+        self._disconnect()
+        return lines[i:]
+    return []
+
+  def _formatMessage(self, now, line, facility, severity):
+    priority = Facilities[facility] * 8 + Severities[severity]
+    message = self.prefix + (line[:-1] if line.endswith(b"\n") else line)
+    pid = str(os.getpid()).encode()
+
+    if self.target.messageFormat == "rfc5424":
+      return b"<%d>1 %s %s %s %s - - %s" % (priority,
+          now.isoformat(timespec="microseconds").encode(), self.hostName,
+          self.tag, pid, message)
+
+    timestamp = "{0} {1:2d} {2}".format(MonthNames[now.month - 1], now.day,
+        now.strftime("%H:%M:%S")).encode()
+    host = self.hostName + b" " if self.target.messageFormat == "rfc3164" \
+        else b""
+    return b"<%d>%s %s%s[%s]: %s" % (priority, timestamp, host, self.tag,
+        pid, message)
+
+  def _disconnect(self):
+    if self._socket is not None:
+      self._socket.close()
+      self._socket = None
@@ -14,46 +14,46 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import threading
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
 
-class _OccurredException(object):
-  def __init__(self, exception):
-    self.exception = exception
+def defaultWorkerCount():
+  return min(32, (os.cpu_count() or 1) + 4)
 
 class _ResultsIterable(object):
-  def __init__(self, results):
-    self.results = results
+  def __init__(self, futures):
+    self.futures = futures
     self.i = 0
 
   def __iter__(self):
     return self
 
   def __next__(self):
-    if self.i >= len(self.results):
+    if self.i >= len(self.futures):
       raise StopIteration()
 
-    ret = self.results[self.i]
+    ret = self.futures[self.i]
     self.i += 1
 
-    if isinstance(ret, _OccurredException):
-      raise ret.exception
-    return ret
-
-class ParallelMapper(object):
-  def map(self, mapFunc, xs):
-    results = [None for _ in xs]
-    threads = [threading.Thread(target=self._threadMain, 
-      args=(mapFunc, results, i, x)) for i, x in enumerate(xs)]
+    try:
+      return ret.result()
+    except Exception:
+      self._finishRemainingFutures()
+      raise
 
-    for thread in threads:
-      thread.start()
-    for thread in threads:
-      thread.join()
+  def _finishRemainingFutures(self):
+    remainingFutures = self.futures[self.i:]
+    for future in remainingFutures:
+      future.cancel()
+    wait(remainingFutures)
 
-    return _ResultsIterable(results)
+class ParallelMapper(object):
+  def __init__(self, maxWorkers=None):
+    self.maxWorkers = maxWorkers or defaultWorkerCount()
 
-  def _threadMain(self, mapFunc, results, i, x):
+  def map(self, mapFunc, xs):
+    executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
     try:
-      results[i] = mapFunc(x)
-    except Exception as ex:
-      results[i] = _OccurredException(ex)
+      return _ResultsIterable([executor.submit(mapFunc, x) for x in xs])
+    finally:
+      executor.shutdown(wait=False)
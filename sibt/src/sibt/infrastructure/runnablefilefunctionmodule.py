@@ -16,30 +16,95 @@
 
 from sibt.infrastructure.exceptions import ExternalFailureException, \
     ModuleFunctionNotImplementedException
+import threading
+import atexit
+import functools
 
 def normalizedLines(lines):
   return [line.strip() for line in lines if line.strip() != ""]
 
+class _ServerPool(object):
+  def __init__(self, processRunner, executable):
+    self.processRunner = processRunner
+    self.executable = executable
+    self.supported = True
+    self._idleServers = []
+    self._allServers = []
+    self._lock = threading.Lock()
+
+  def _acquire(self):
+    if not hasattr(self.processRunner, "startServer"):
+      return None
+
+    with self._lock:
+      if len(self._idleServers) > 0:
+        return self._idleServers.pop()
+
+    ret = self.processRunner.startServer(self.executable)
+    if ret is None:
+      self.supported = False
+      return None
+
+    with self._lock:
+      if len(self._allServers) == 0:
+        atexit.register(self.close)
+      self._allServers.append(ret)
+    return ret
+
+  def _release(self, server):
+    with self._lock:
+      if server.alive:
+        self._idleServers.append(server)
+      else:
+        self._allServers.remove(server)
+
+  def getOutput(self, fallback, program, *arguments, delimiter):
+    server = self._acquire() if self.supported else None
+    if server is None:
+      return fallback(program, *arguments, delimiter=delimiter)
+
+    try:
+      return server.getOutput(*arguments, delimiter=delimiter)
+    finally:
+      self._release(server)
+
+  def close(self):
+    with self._lock:
+      for server in self._allServers:
+        server.close()
+      self._allServers.clear()
+      self._idleServers.clear()
+
 class RunnableFileFunctionModule(object):
   def __init__(self, processRunner, filePath):
     self.processRunner = processRunner
     self.executable = filePath
+    self._servers = _ServerPool(processRunner, filePath)
 
   def _call(self, execFunction, funcName, positionalArgs, options, **kwargs):
     return self._catchNotImplemented(lambda: execFunction(self.executable, 
       funcName, *(list(positionalArgs) + self._keyValueEncode(options)),
       **kwargs), funcName)
 
+  def _callServed(self, funcName, positionalArgs, options, delimiter):
+    return self._call(functools.partial(self._servers.getOutput, 
+      self.processRunner.getOutput), funcName, positionalArgs, options,
+      delimiter=delimiter)
+
   def callVoid(self, funcName, positionalArgs, options):
     self._call(self.processRunner.execute, funcName, positionalArgs, options)
 
   def callExact(self, funcName, positionalArgs, options):
+    return self._callServed(funcName, positionalArgs, options, 
+        delimiter="\0")
+
+  def callExactStreaming(self, funcName, positionalArgs, options):
     return self._call(self.processRunner.getOutput, funcName, 
         positionalArgs, options, delimiter="\0")
 
   def callFuzzy(self, funcName, positionalArgs, options):
-    return normalizedLines(self._call(self.processRunner.getOutput, funcName, 
-      positionalArgs, options, delimiter="\n"))
+    return normalizedLines(self._callServed(funcName, positionalArgs, options,
+      delimiter="\n"))
 
   def _catchNotImplemented(self, func, funcName):
     try:
@@ -14,9 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import time
 
+DefaultSchedulingInterval = timedelta(days=3)
+
 def toUTC(localDateTime):
   timeTuple = localDateTime.timetuple()
   return datetime.fromtimestamp(time.mktime(timeTuple), timezone.utc)
@@ -24,3 +26,14 @@ def toUTC(localDateTime):
 def withoutTimeOfDay(dateTime):
   return datetime(dateTime.year, dateTime.month, dateTime.day, 0, 0, 0, 0, 
       dateTime.tzinfo)
+
+def timeAfterInterval(lastTime, interval):
+  lastLocalTime = lastTime.astimezone()
+  if interval >= timedelta(days=1):
+    lastLocalTime = withoutTimeOfDay(lastLocalTime)
+  return toUTC(lastLocalTime + interval)
+
+def nextTimeWithInterval(lastTime, interval, now):
+  if lastTime is None:
+    return now
+  return max(timeAfterInterval(lastTime, interval), now)
@@ -32,6 +32,10 @@ from sibt.infrastructure.exceptions import ExternalFailureException, \
     SynchronizerFuncNotImplementedException
 from sibt.application.sibtargsparser import SibtArgsParser
 from sibt.application.configrepo import ConfigRepo
+from sibt.application.sshfsmountpool import SSHFSMountPool
+from sibt.application.schedulerdaemon import SchedulerDaemon, \
+    configFilesStamp
+from sibt.infrastructure.inotifywatcher import InotifyWatcher
 import sys
 from sibt.infrastructure.pymoduleloader import PyModuleLoader
 from sibt.domain import subvalidators
@@ -142,9 +146,24 @@ def fatalSignalsRetained():
     setFatalSignalsHandler(signalHandler(raiseException=True))
   afterSubprocessRun(0)
 
+def mapRetainingSignals(mapper, mapFunc, xs):
+  with fatalSignalsRetained():
+    return list(mapper.map(mapFunc, xs))
+
+def closeMountPool(mountPool, errorLogger):
+  beforeSubprocessRun()
+  try:
+    mountPool.close()
+  except FatalSignalException as ex:
+    killSelf(ex.signalNumber)
+  except ExternalFailureException as ex:
+    printKnownException(ex, errorLogger)
+  finally:
+    setFatalSignalsHandler(signalHandler(raiseException=True))
+
 def logSubProcess(log, subProcessArgs, environmentVars=None, **kwargs):
   if environmentVars is not None:
-    os.environ.update(environmentVars)
+    kwargs["env"] = dict(os.environ, **environmentVars)
 
   with fatalSignalsRetained():
     streamRead, streamWrite = os.pipe()
@@ -165,6 +184,7 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
   setFatalSignalsHandler(signalHandler(raiseException=True))
 
   errorLogger = PrefixingErrorLogger(stderr, "sibt", 0)  
+  mountPool = SSHFSMountPool(processRunner)
   try:
     argParser = SibtArgsParser()
     parserExitStatus, args = argParser.parseArgs(cmdLineArgs, stdout, stderr)
@@ -181,19 +201,29 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
     overridePaths(paths, args)
     createNotExistingDirs(paths)
 
+    workerCount = parallelWorkerCount(args)
+    if workerCount == 0:
+      errorLogger.log("number of jobs must be a positive integer")
+      return 1
+
     readSysConf = userId != 0 and not args.options["no-sys-config"]
 
     useDrySchedulers = args.options.get("dry", False)
 
     currentSibtCall = [sys.argv[0]] + args.globalOptionsArgs
-    configRepo = ConfigRepo.load(paths, sysPaths, readSysConf, processRunner,
-        clock, moduleLoader, currentSibtCall,
-        functools.partial(wrapScheduler, useDrySchedulers, stdout, stderr, 
-          clock, args.options["verbose"]),
+    loadConfigRepo = lambda onlyUserRuleName=None: ConfigRepo.load(paths,
+        sysPaths, readSysConf, processRunner, clock, moduleLoader,
+        currentSibtCall, functools.partial(wrapScheduler, useDrySchedulers,
+          stdout, stderr, clock, args.options["verbose"],
+          paths.checksCacheDir),
         makeErrorLogger,
         (lambda rule: True) if args.options.get("show-sys", False) else \
-            (lambda rule: rule.options["AllowedForUsers"] == userName))
-    validator = constructRulesValidator([MountPointAssertionsTrueValidator()])
+            (lambda rule: rule.options["AllowedForUsers"] == userName),
+        mountPool, onlyUserRuleName, args.action != "check")
+    configRepo = loadConfigRepo(args.options["rule-name"] if args.action in
+        ["sync", "execute-rule"] else None)
+    validator = constructRulesValidator([MountPointAssertionsTrueValidator()],
+        functools.partial(mapRetainingSignals, ParallelMapper(workerCount)))
     unstablePhaseDetector = ExecutionClosenessDetector(clock,
         timedelta(hours=1))
 
@@ -272,7 +302,7 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
           None, logSubProcess)
       try:
         succeeded = rule.execute(execEnv, clock, 
-            FcntlMutexManager(paths.lockDir))
+            FcntlMutexManager(paths.lockDir), errorLogger)
       except LockException as ex:
         errorLogger.log(
           "‘{0}’ is already executing, could not acquire lock", rule.name, 
@@ -282,6 +312,21 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
       if not succeeded:
         return 3
 
+    elif args.action == "daemon":
+      def executeRule(rule):
+        execEnv = ExecEnvironment(callToSibtSync(currentSibtCall) + 
+            [rule.name], None, logSubProcess)
+        rule.execute(execEnv, clock, FcntlMutexManager(paths.lockDir),
+            errorLogger)
+
+      try:
+        watcher = InotifyWatcher(configRepo.configDirs)
+      except OSError:
+        watcher = None
+      SchedulerDaemon(loadConfigRepo, functools.partial(configFilesStamp,
+        configRepo.configDirs), executeRule, clock, errorLogger,
+        workerCount=workerCount, watcher=watcher).run()
+
     elif args.action == "list":
       printingToTTY = args.options["tty"] or sys.stdout.isatty()
       printer = TabulatingConfigPrinter(stdout,
@@ -315,16 +360,14 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
             locationFromArg(args.options["file"]), 
             args.action != "restore", unstablePhaseDetector)
 
-      mapper = ParallelMapper()
-      beforeSubprocessRun()
-      versionss = mapper.map(getVersions, configRepo.rulesFinder.getAll())
-      afterSubprocessRun(0)
-
-      for versions in versionss:
-        for version in versions:
-          string = version.strWithUTCW3C if args.options["utc"] else \
-              version.strWithLocalW3C
-          stringsToVersions[string] = version
+      mapper = ParallelMapper(workerCount)
+      with fatalSignalsRetained():
+        for versions in mapper.map(getVersions, 
+            configRepo.rulesFinder.getAll()):
+          for version in versions:
+            string = version.strWithUTCW3C if args.options["utc"] else \
+                version.strWithLocalW3C
+            stringsToVersions[string] = version
 
       if args.action == "versions-of":
         if len(stringsToVersions) == 0:
@@ -376,8 +419,10 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
     except (NameError, AttributeError):
       cliAction = ""
     errorLogger.log(cliAction + str(ex))
+    closeMountPool(mountPool, errorLogger)
     killSelf(ex.signalNumber)
   except BrokenPipeError as ex:
+    closeMountPool(mountPool, errorLogger)
     killSelf(signal.SIGPIPE)
   except (ConfigurableNotFoundException) as ex:
     printKnownException(ex, errorLogger, additionalInfo=
@@ -392,6 +437,8 @@ def run(cmdLineArgs, stdout, stderr, processRunner, paths, sysPaths,
       LocationInvalidException) as ex:
     printKnownException(ex, errorLogger)
     return 1
+  finally:
+    closeMountPool(mountPool, errorLogger)
 
 def printKnownException(ex, errorLogger, baseVerbosity=0, 
     causeIsEssential=False, additionalInfo=None):
@@ -433,6 +480,16 @@ def overridePaths(paths, cmdLineArgs):
   if newReadonlyDir:
     paths.readonlyDir = newReadonlyDir
 
+def parallelWorkerCount(cmdLineArgs):
+  value = cmdLineArgs.options.get("jobs", None) or \
+      os.environ.get("SIBT_JOBS", "")
+  if value == "":
+    return None
+  try:
+    return max(0, int(value))
+  except ValueError:
+    return 0
+
 def createNotExistingDirs(paths):
   DirTreeNormalizer(paths).createNotExistingDirs()
 
@@ -465,10 +522,10 @@ def printValidationErrors(printFuncForRuleNames, printFunc, ruleSet, errors):
     printFunc(error)
 
 def wrapScheduler(useDrySchedulers, stdout, stderr, clock, 
-    forceLoggingToStderr, sched):
+    forceLoggingToStderr, checksCacheDir, sched):
   ret = DryScheduler(sched, stdout) if useDrySchedulers else sched
   ret = DefaultImplScheduler(ret)
-  ret = ScriptRunningScheduler(ret)
+  ret = ScriptRunningScheduler(ret, checksCacheDir)
   return LoggingScheduler(ret, clock, stderr, forceLoggingToStderr)
 
 def enableRule(output, baseName, paths, instanceName, configLines):
@@ -39,7 +39,7 @@ from test.acceptance.schedulerbuilder import SchedulerBuilder
 from test.acceptance.rulebuilder import RuleBuilder
 from test.acceptance.configscenarioconstructor import ConfigScenarioConstructor
 from test.common.builders import clockWithOrderedTimes, constantTimeClock, \
-    anyUTCDateTime, toTimestamp
+    anyUTCDateTime, toTimestamp, orderedDateTimes
 from test.common.rfc3164syslogserver import Rfc3164SyslogServer
 from test.sibt.infrastructure.utillinuxsyslogger_test import loggerOptions
 from datetime import timedelta, datetime, timezone
@@ -337,6 +337,22 @@ def test_shouldIgnoreSysRulesThatArentAllowedForTheCurrentUserOrUnreadable(
   fixture.runSibt("ls", "*")
   fixture.shouldHaveExitedWithStatus(1)
 
+def test_shouldAcceptALimitForTheNumberOfRulesQueriedInParallel(fixture):
+  syncer = fixture.conf.syncerReturningVersions(forRelativeFile="file",
+      ifWithinLoc1=["500"]).write()
+  fixture.conf.ruleWithSched("limited").withLoc1("/src").withLoc2("/dest").\
+      withSynchronizer(syncer).write()
+
+  fixture.runSibtWithRealStreamsAndExec("--jobs", "1", "versions-of", 
+      "/src/file")
+  fixture.shouldHaveExitedWithStatus(0)
+  fixture.stdout.shouldContainLinePatterns("*limited*")
+
+  fixture.runSibtWithRealStreamsAndExec("--jobs", "none", "versions-of",
+      "/src/file")
+  fixture.shouldHaveExitedWithStatus(1)
+  fixture.stderr.shouldInclude("jobs")
+
 def test_shouldListDisallowedSysRulesAnywayIfShowSysIsOn(fixture):
   rule = fixture.conf.ruleWithSchedAndSyncer(isSysConfig=True).write()
 
@@ -1245,6 +1261,18 @@ def test_shouldProvideAccessToExecutionStatisticsViaAPythonInterface(fixture):
         execution.endTime == fourthTime and
         execution.succeeded == False)
 
+def test_shouldRemoveOldExecutionsFromTheLogAccordingToTheRuleOptions(fixture):
+  rule = fixture.conf.ruleWithSchedAndSyncer().withOpts(KeepLogs="1").write()
+  firstTime, secondTime, thirdTime, fourthTime = orderedDateTimes(4)
+
+  fixture.executeOnce(rule, firstTime, secondTime)
+  fixture.executeOnce(rule, thirdTime, fourthTime)
+
+  from sibt.api import openLog
+  log = openLog(sibtPaths=fixture.paths, sibtSysPaths=None)
+  iterToTest(log.executionsOfRules("*")[rule.name]).shouldContainMatching(
+      lambda execution: execution.startTime == thirdTime)
+
 def test_shouldReadSysAlongsideUserStatistics(fixture):
   time = anyUTCDateTime()
   fixture.setClock(constantTimeClock(time))
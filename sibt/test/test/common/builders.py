@@ -45,10 +45,11 @@ def withRandstring(string):
 In1985 = datetime(1985, 1, 1, tzinfo=timezone.utc)
 
 def anyScheduling(): return buildScheduling()
-def buildScheduling(ruleName=None, lastTime=In1985, **options):
+def buildScheduling(ruleName=None, lastTime=In1985, destinations=(),
+    **options):
   if ruleName is None:
     ruleName = withRandstring("any-rule")
-  return Scheduling(ruleName, options, lastTime)
+  return Scheduling(ruleName, options, lastTime, destinations)
 def scheduling():
   return SchedulingBuilder()
 
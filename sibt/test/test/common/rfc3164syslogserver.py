@@ -18,6 +18,7 @@ from socketserver import UDPServer, BaseRequestHandler
 from threading import Thread
 from collections import namedtuple
 import time
+import select
 import re
 
 PacketRegex = re.compile(
@@ -87,9 +88,14 @@ class Rfc3164SyslogServer(object):
 
     return self
 
+  def _handlePendingPackets(self):
+    while len(select.select([self.server.socket], [], [], 0)[0]) > 0:
+      self.server.handle_request()
+
   def __exit__(self, exceptionType, ex, traceback):
     self.server.shutdown()
     self.thread.join()
+    self._handlePendingPackets()
     self.server.server_close()
 
 
@@ -76,6 +76,19 @@ class RunnerTest(object):
       exitStatus), fixture)
     assert ex.exitStatus == exitStatus
 
+  def test_shouldSourceTheSynchronizerOnlyOnceForSeveralQueries(self, 
+      fixture):
+    counterFile = fixture.tmpdir.join("loaded")
+    syncer = self.loadSynchronizerWithCode(
+        self.codeCountingLoadsAndWithOptions(str(counterFile), "Foo"), fixture)
+
+    for _ in range(3):
+      assert [option.name for option in syncer.availableOptions][0] == "Foo"
+    _ = syncer.ports
+    assert syncer.versionsOf(mkSyncerOpts(), "/mnt/data/bar", 1) == []
+
+    assert counterFile.read() == "x"
+
 @pytest.fixture
 def bashFuncFixture():
   return BashFuncTestFixture(relativeToProjectRoot(
@@ -92,6 +105,37 @@ class Test_BashRunnerTest(RunnerTest):
         echo finished
       }}""".format(exitStatus)
 
+  def codeCountingLoadsAndWithOptions(self, counterFile, *optionNames):
+    return """
+      echo -n x >>'{0}'
+      available-options() {{
+        echo '{1}'
+      }}""".format(counterFile, "\n".join(optionNames))
+
+  def test_shouldBeAbleToDescribeASynchronizerInTermsOfItsInfoFunctions(self,
+      fixture):
+    syncer = self.loadSynchronizerWithCode("""
+      available-options() {
+        echo 'b Foo'
+      }
+      info-of-port() {
+        if [ "$1" = specials ]; then
+          echo one-must-be-file
+        elif [ "$1" = 1 ]; then
+          echo 0
+          echo file
+        fi
+      }
+      describe() {
+        describe-by-info-functions
+      }""", fixture)
+
+    assert "Foo" in [option.name for option in syncer.availableOptions]
+    iterToTest(syncer.ports).shouldContainMatching(
+        lambda port: "file" in port.supportedProtocols and \
+            not port.isWrittenTo)
+    assert syncer.onePortMustHaveFileProtocol
+
   def test_shouldFailIfUnsetVariableIsUsed(self, fixture):
     self.assertFailureWithSyncCode("""
       sync() {
@@ -183,6 +227,12 @@ def sync(**_):
   subprocess.check_call(["bash", "-c", "exit 5"])
         """
 
+  def codeCountingLoadsAndWithOptions(self, counterFile, *optionNames):
+    return """
+with open({0}, "a") as counterFile:
+  counterFile.write("x")
+availableOptions = {1}""".format(repr(counterFile), repr(list(optionNames)))
+
   def test_shouldHandleOtherExceptionsAsUsualByPrintingTraceAndExitingWith1(
       self, fixture, capfd):
     ex = self.assertFailureWithSyncCode("""
@@ -193,3 +243,16 @@ def sync(**_):
     _, stderr = capfd.readouterr()
     assert "foo" in stderr
     assert "sync" in stderr
+
+  def test_shouldTreatNoneReturnedByCheckOrListFilesAsAnEmptyList(self,
+      fixture):
+    syncer = self.loadSynchronizerWithCode("""
+def check(**_):
+  pass
+def listFiles(*_, **__):
+  return None""", fixture)
+    assert syncer.check(mkSyncerOpts()) == []
+    files = []
+    syncer.listFiles(mkSyncerOpts(), lambda *args: files.append(args),
+        "/tmp/file", 1, anyUTCDateTime(), True)
+    assert files == []
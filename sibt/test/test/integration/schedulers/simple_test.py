@@ -17,7 +17,7 @@
 import pytest
 import os
 import time
-from test.common.builders import buildScheduling
+from test.common.builders import buildScheduling, sshLocation
 from test.integration.schedulers.leafschedulertest import LeafSchedulerTest, \
     LeafSchedulerTestFixture, BeginningOf1985, toUTC
 from datetime import timedelta, datetime
@@ -52,6 +52,42 @@ class Test_SimpleSchedTest(LeafSchedulerTest):
     for flagFile in flagFiles:
       assert os.path.isfile(str(flagFile))
       
+  def test_shouldLimitTheNumberOfRulesExecutedInParallelIfRequested(
+      self, fixture):
+    assert "MaxParallel" in fixture.optionNames
+    assert "MaxParallelPerDestination" in fixture.optionNames
+
+    logFile = fixture.miscDir / "log"
+    names = ["first", "second", "third", "fourth"]
+    schedulings = [buildScheduling(name, lastTime=toUTC(datetime(
+      1984, 1, 1 + i)), MaxParallel=2) for i, name in enumerate(names)]
+    schedulings[0].lastExecutionTime = None
+
+    startSeconds = time.perf_counter()
+    fixture.scheduleWithMockedSibt(r"""#!/usr/bin/env bash
+      echo "$3" >>"{0}"
+      sleep 0.2""".format(logFile), list(reversed(schedulings)))
+    elapsedSeconds = time.perf_counter() - startSeconds
+    assert elapsedSeconds > 0.4
+    assert elapsedSeconds < 0.6
+
+    loggedNames = logFile.read().splitlines()
+    assert set(loggedNames[:2]) == set(names[:2])
+    assert set(loggedNames[2:]) == set(names[2:])
+
+  def test_shouldOnlyExecuteOneRuleAtATimePerDestinationHostIfRequested(
+      self, fixture):
+    schedulings = [buildScheduling(name, destinations=(
+      sshLocation(host=host, path="/"),), MaxParallelPerDestination=1) for
+      name, host in [("a", "foo"), ("b", "foo"), ("c", "bar")]]
+
+    startSeconds = time.perf_counter()
+    fixture.scheduleWithMockedSibt(r"""#!/usr/bin/env bash
+      sleep 0.2""", schedulings)
+    elapsedSeconds = time.perf_counter() - startSeconds
+    assert elapsedSeconds > 0.4
+    assert elapsedSeconds < 0.6
+
   def test_shouldScheduleTheNextAtLastTimePlusIntervalDisregardingTimeOfDay(
       self, fixture):
     assert "Interval" in fixture.optionNames
@@ -135,6 +135,22 @@ class Test_DuplicityTest(UnidirectionalSyncerTest, IncrementalSynchronizerTest):
       with difftar.extractfile("snapshot/file") as fileInBackup:
         assert fileInBackup.read() == b"secret"
 
+  def test_shouldAnswerFileListingsOfKnownBackupSetsFromALocalCache(
+      self, fixture):
+    (fixture.loc1 / "file").write("")
+    version = fixture.getSingleVersion()
+    assert fixture.versionsOf("file", 1) == [version]
+
+    cachedLists = glob.glob(str(fixture.archiveDir / "sibt-file-lists" /
+      "*" / "*"))
+    assert len(cachedLists) == 1
+    with open(cachedLists[0], "wb") as cachedList:
+      cachedList.write(b"file\0other\0")
+
+    assert set(fixture.listPort1Files(".", version, recursively=True)) == \
+        set(["file", "other"])
+    assert fixture.versionsOf("other", 1) == [version]
+
   def test_shouldSupportOnlyFileAtPort1AndSeveralProtocolsAtPort2(
       self, fixture):
     fixture.protocolsOfPort(1).shouldContain("file")
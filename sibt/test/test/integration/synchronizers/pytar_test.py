@@ -16,7 +16,8 @@
 
 import pytest
 from test.integration.synchronizers.synchronizertest import \
-    RunnableFileSynchronizerTestFixture, IncrementalSynchronizerTest
+    RunnableFileSynchronizerTestFixture, IncrementalSynchronizerTest, \
+    UnidirectionalSyncerTest
 import tarfile
 from test.common.builders import localLocation
 from test.common.assertutil import iterableContainsInAnyOrder
@@ -41,7 +42,7 @@ def archiveFileHasContents(archivePath, name, expectedContents):
     with tar.extractfile(name) as archivedFile:
       return archivedFile.read().decode() == expectedContents
 
-class Test_TarTest(object):
+class Test_PyTarTest(UnidirectionalSyncerTest, IncrementalSynchronizerTest):
   def test_shouldKeepAsManyArchivesAsSpecifiedAndCycleThroughThem(self, 
       fixture):
     assert "KeepCopies" in fixture.optionNames
@@ -70,8 +71,3 @@ class Test_TarTest(object):
 
   def test_shouldTellThatItWritesToLoc2(self, fixture):
     assert fixture.syncer.ports[1].isWrittenTo 
-
-
-
-#TODO
-#should remember the time the backup was made (simply mtime?)
@@ -158,3 +158,23 @@ class Test_FileTypeTestFunctionTest(object):
       { echo '0 directory'
         echo '10 regular'
         echo '20 directory'; } | -parse-repo-file-type 9""") == b"regular\n"
+
+class Test_MirrorMetadataToolTest(object):
+  def test_shouldMarkDirectoriesByPatchingTheNextSnapshotWithAllDiffs(
+      self, funcFixture, tmpdir):
+    fileNames = ["mirror_metadata.1970-01-01T01:00:10+01:00.diff.gz",
+        "mirror_metadata.1970-01-01T00:00:20Z.diff.gz",
+        "mirror_metadata.1970-01-01T00-00-30+00-00.snapshot.gz",
+        "mirror_metadata.1970-01-01T00:00:40Z.snapshot.gz",
+        "increments"]
+    assert funcFixture.compute("-run-metadata-tool needed-files 15",
+        input="\n".join(fileNames).encode()).decode().splitlines() == [
+            fileNames[2], fileNames[1]]
+
+    snapshot = "File .\n  Type dir\nFile a\n  Type reg\nFile b\n  Type dir\n"
+    diff = "File a\n  Type dir\nFile b\n  Type None\nFile c\\\\\n  Type dir\n"
+    tmpdir.join("metadata").write(snapshot + "\0" + diff + "\0")
+
+    assert funcFixture.compute("-run-metadata-tool mark-directories '{0}'".
+        format(tmpdir.join("metadata")),
+        input=b"./a\0./a/x\0b\0c\\\0./\0") == b"./a/\0./a/x\0b\0c\\/\0.//\0"
@@ -123,6 +123,14 @@ class Test_TarTest(UnidirectionalSyncerTest, IncrementalSynchronizerTest,
     assert archiveFileHasContents(fixture.loc2 / "ar1", 
         lambda info: info.name.endswith("./etc/fstab"), quote)
 
+  def test_shouldKeepAnIndexNextToEachSnapshot(self, fixture):
+    (fixture.loc1 / "file").write("")
+    fixture.sync(dict())
+    fixture.sync(dict())
+
+    assert (fixture.loc2 / "snapshot1.index").exists()
+    assert (fixture.loc2 / "snapshot2.index").exists()
+
 class ParserFixture(BashFuncTestFixture):
   def __init__(self, tmpdir):
     super().__init__(relativeToProjectRoot("sibt/synchronizers/tar"))
@@ -132,6 +140,10 @@ class ParserFixture(BashFuncTestFixture):
     with open(str(self.snapshotFile), "wb") as file:
       file.write(content)
 
+  def buildIndex(self):
+    self.compute("-run-snapshot-tool build '{0}' '{0}.index'".format(
+      self.snapshotFile))
+
   def parse(self, snapshotFileContent, additionalArgs=""):
     self.writeSnapshotFile(snapshotFileContent)
     return self.compute("-parse-snapshot-file '{0}' {1}".format(
@@ -228,3 +240,24 @@ class Test_TarSnapshotParserTest(object):
     assert parserFixture.parseTestFile("test 'directory/foo'") == b""
     assert parserFixture.parseTestFile("test directory") == b"directory"
     assert parserFixture.parseTestFile("test topfile") == b"N"
+
+  def test_shouldAnswerQueriesWithAnIndexUnlessTheSnapshotChanged(self,
+      parserFixture):
+    parserFixture.parseTestFile("timestamp")
+    parserFixture.buildIndex()
+    assert parserFixture.compute("-parse-snapshot-file '{0}' test topfile".\
+        format(parserFixture.snapshotFile)) == b"N"
+
+    assert parserFixture.parse(
+        b"GNU tar-1.28-2\n"
+        b"1234\0"
+        b"567000000\0"
+
+        b"0\0"
+        b"123\0"
+        b"123\0"
+        b"0\0"
+        b"0\0"
+        b".\0"
+          b"Yotherfile\0"
+          b"\0\0", "test topfile") == b""
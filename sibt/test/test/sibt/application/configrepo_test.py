@@ -0,0 +1,117 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from test.common import mock
+from sibt.application.configrepo import ConfigRepo, RulesRepo
+from sibt.application.rulesfinder import RulesFinder
+from sibt.configuration.configurablelist import ConfigurableList, \
+    LazyConfigurable
+from sibt.configuration.lazysyncrule import LazySyncRule
+
+class Fixture(object):
+  def __init__(self):
+    self.userRules = []
+    self.sysRules = []
+    self.syncerNames = ["syncer"]
+    self.loadCounts = dict()
+    self.dirKinds = {
+        "/rules": [("rules", 0)],
+        "/enabled": [("enabled", 0)],
+        "/include": [("include", 0)],
+        "/sys-rules": [("rules", 1)],
+        "/synchronizers": [("synchronizers", None)],
+        "/runners": [("runners", None)] }
+
+  def addRule(self, name, enabled=True, syncerName="syncer", sysRule=False):
+    def load():
+      self.loadCounts[name] = self.loadCounts.get(name, 0) + 1
+      ret = mock.mock()
+      ret.name = name
+      ret.syncerName = syncerName
+      ret.scheduler = mock.mock()
+      ret.scheduler.name = "sched"
+      return ret
+    (self.sysRules if sysRule else self.userRules).append(
+        LazySyncRule(name, enabled, load))
+
+  def construct(self):
+    rescanSyncers = lambda: [LazyConfigurable(name, lambda name=name: name)
+        for name in self.syncerNames]
+    self.synchronizers = ConfigurableList(rescanSyncers(), rescanSyncers)
+    schedulers = ConfigurableList([], lambda: [])
+    rulesFinder = RulesFinder(RulesRepo(self.userRules),
+        RulesRepo(self.sysRules), lambda rule: True)
+    return ConfigRepo(schedulers, self.synchronizers, rulesFinder,
+        lambda: (list(self.userRules), list(self.sysRules)), self.dirKinds)
+
+def loadAll(repo):
+  for name in repo.rulesFinder.userRules.names:
+    repo.rulesFinder.userRules.getRule(name, False)
+
+@pytest.fixture
+def fixture():
+  return Fixture()
+
+def test_shouldOnlyReloadRulesWhoseFilesChanged(fixture):
+  fixture.addRule("a")
+  fixture.addRule("b", enabled=False)
+  fixture.addRule("inst@base")
+  repo = fixture.construct()
+  loadAll(repo)
+
+  fixture.userRules[1] = LazySyncRule("b", True,
+      fixture.userRules[1].loadFunc)
+  assert repo.applyChanges([("/enabled", "b")])
+  loadAll(repo)
+  assert repo.rulesFinder.userRules.enabledNames == ["a", "b", "inst@base"]
+  assert fixture.loadCounts == { "a": 1, "b": 2, "inst@base": 1 }
+
+  assert repo.applyChanges([("/rules", "base")])
+  loadAll(repo)
+  assert fixture.loadCounts == { "a": 1, "b": 2, "inst@base": 2 }
+
+  assert repo.applyChanges([("/include", "common.inc")])
+  loadAll(repo)
+  assert fixture.loadCounts == { "a": 2, "b": 3, "inst@base": 3 }
+
+def test_shouldAddAndRemoveRulesThatAppearedOrDisappeared(fixture):
+  fixture.addRule("a")
+  repo = fixture.construct()
+  loadAll(repo)
+
+  fixture.userRules[:] = []
+  fixture.addRule("b")
+  assert repo.applyChanges([("/rules", "a"), ("/rules", "b")])
+  assert repo.rulesFinder.userRules.names == ["b"]
+
+def test_shouldReloadChangedSynchronizersAndTheRulesUsingThem(fixture):
+  fixture.addRule("a", syncerName="syncer")
+  fixture.addRule("b", syncerName="other")
+  fixture.syncerNames = ["syncer", "other"]
+  repo = fixture.construct()
+  loadAll(repo)
+
+  fixture.syncerNames = ["other"]
+  assert repo.applyChanges([("/synchronizers", "syncer")])
+  loadAll(repo)
+  assert list(repo.synchronizers) == ["other"]
+  assert fixture.loadCounts == { "a": 2, "b": 1 }
+
+def test_shouldRequireAFullReloadIfRunnersChange(fixture):
+  repo = fixture.construct()
+  assert not repo.applyChanges([("/runners", "bash-runner")])
+  assert not ConfigRepo(None, None, None).applyChanges([("/rules", "a")])
@@ -76,3 +76,16 @@ def test_shouldPrependRunnerToArgsIfHashbangLineMatchesRunnerName(fixture):
 
 
 
+
+def test_shouldOnlyStartServersForExecutablesInterpretedByAKnownRunner(
+    fixture):
+  runnerPath, knownRunner = existingRunner(fixture.tmpdir, "runner")
+  server = object()
+
+  wrapped, runner = fixture.construct([knownRunner])
+  wrapped.expectCallsInOrder(mock.call("startServer", 
+    (runnerPath, fixture.writeExecutable("#!runner\n")), ret=server))
+  assert runner.startServer(fixture.writeExecutable("#!runner\n")) is server
+  wrapped.checkExpectedCalls()
+
+  assert runner.startServer(fixture.writeExecutable("#!/bin/sh\n")) is None
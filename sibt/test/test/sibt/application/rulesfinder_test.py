@@ -0,0 +1,62 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from sibt.application.configrepo import RulesRepo
+from sibt.application.rulesfinder import RulesFinder
+from sibt.application.exceptions import RulePatternMismatchException
+from sibt.configuration.lazysyncrule import LazySyncRule
+
+class FakeRule(object):
+  def __init__(self, name):
+    self.name = name
+
+def repoWith(enabledNames, disabledNames=[]):
+  return RulesRepo([LazySyncRule(name, True, lambda name=name: FakeRule(name))
+    for name in enabledNames] + [LazySyncRule(name, False, lambda name=name:
+      FakeRule(name)) for name in disabledNames])
+
+def namesOf(rules):
+  return sorted(rule.name for rule in rules)
+
+@pytest.fixture
+def finder():
+  return RulesFinder(repoWith(["home", "home-media", "etc", "a@base"], 
+    ["disabled", "old-home"]), repoWith(["+sys"]), lambda rule: True)
+
+def test_shouldMatchEachPatternAgainstTheNamesOfEnabledRules(finder):
+  assert namesOf(finder.findRulesByPatterns(["home*", "e?c", "*@base"], 
+    onlySyncRules=True)) == ["a@base", "etc", "home", "home-media"]
+  assert namesOf(finder.findRulesByPatterns(["*home*"], 
+    onlySyncRules=True)) == ["home", "home-media"]
+  assert namesOf(finder.findRulesByPatterns(["[!h]*"], 
+    onlySyncRules=False)) == ["+sys", "a@base", "disabled", "etc",
+        "old-home"]
+
+def test_shouldFindDisabledRulesOnlyByTheirExactName(finder):
+  assert namesOf(finder.findRulesByPatterns(["disabled", "et*"], 
+    onlySyncRules=True)) == ["disabled", "etc"]
+
+  with pytest.raises(RulePatternMismatchException) as ex:
+    finder.findRulesByPatterns(["home", "dis*"], onlySyncRules=True)
+  assert ex.value.pattern == "dis*"
+
+def test_shouldReturnAllRulesIncludingDisabledOnes(finder):
+  for _ in range(2):
+    assert namesOf(finder.getAll()) == ["+sys", "a@base", "disabled", "etc",
+        "home", "home-media", "old-home"]
+  assert finder.userRules.enabledNames == ["home", "home-media", "etc", 
+      "a@base"]
@@ -0,0 +1,292 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+import threading
+import os
+import time
+from datetime import timedelta
+from test.common import mock
+from test.common.builders import mockRule, mockSched, constantTimeClock, \
+    anyUTCDateTime, execEnvironment
+from test.common.bufferinglogger import BufferingLogger
+from sibt.domain.execution import Execution
+from sibt.domain.exceptions import LockException
+from sibt.application.schedulerdaemon import SchedulerDaemon, \
+    configFilesStamp
+from sibt.main import logSubProcess
+
+Now = anyUTCDateTime()
+
+def executionAt(time):
+  return Execution(time, b"", None)
+
+class FakeConfigRepo(object):
+  def __init__(self, rules, canApplyChanges=False):
+    self.rules = dict((rule.name, rule) for rule in rules)
+    self.rulesFinder = self
+    self.userRules = self
+    self.enabledNames = list(self.rules.keys())
+    self.canApplyChanges = canApplyChanges
+    self.appliedChanges = []
+
+  def getSyncRule(self, name):
+    return self.rules[name]
+
+  def applyChanges(self, changedFiles):
+    self.appliedChanges.extend(changedFiles)
+    return self.canApplyChanges
+
+class FakeWatcher(object):
+  def __init__(self):
+    self.changes = []
+
+  def waitForChanges(self):
+    while len(self.changes) == 0:
+      time.sleep(0.01)
+    ret = self.changes
+    self.changes = []
+    return ret
+
+class Fixture(object):
+  def __init__(self):
+    self.loadedRepos = []
+    self.repo = FakeConfigRepo([])
+    self.stamp = 1
+    self.executedRules = []
+    self.executionDone = threading.Event()
+    self.errorLogger = mock.mock()
+
+  def executeRule(self, rule):
+    self.executedRules.append(rule.name)
+    self.executionDone.set()
+
+  def loadRepo(self):
+    self.loadedRepos.append(self.repo)
+    return self.repo
+
+  def construct(self, executeRule=None, watcher=None):
+    return SchedulerDaemon(self.loadRepo, lambda: self.stamp,
+        executeRule or self.executeRule, constantTimeClock(Now),
+        self.errorLogger, maxSleepInS=60, watcher=watcher)
+
+  def rule(self, name, nextTime=None, schedulerName="daemon"):
+    ret = mockRule(name=name, scheduler=mockSched(schedulerName),
+        nextExecution=None if nextTime is None else executionAt(nextTime))
+    ret.forgottenExecutions = 0
+    def forgetCachedExecutions():
+      ret.forgottenExecutions += 1
+    ret.forgetCachedExecutions = forgetCachedExecutions
+    return ret
+
+@pytest.fixture
+def fixture():
+  return Fixture()
+
+def test_shouldExecuteDueRulesOfItsSchedulerAndSleepUntilTheNextOne(
+    fixture):
+  fixture.repo = FakeConfigRepo([
+    fixture.rule("due", Now - timedelta(minutes=1)),
+    fixture.rule("other-scheduler", Now, schedulerName="simple"),
+    fixture.rule("executing", None),
+    fixture.rule("later", Now + timedelta(minutes=5)),
+    fixture.rule("soon", Now + timedelta(seconds=30))])
+  daemon = fixture.construct()
+
+  assert daemon.runDueRules() == 30
+  assert fixture.executionDone.wait(1)
+  assert fixture.executedRules == ["due"]
+
+def test_shouldSleepForTheMaximumTimeIfThereAreNoRules(fixture):
+  assert fixture.construct().runDueRules() == 60
+
+def test_shouldNotStartARuleAgainWhileItIsStillRunning(fixture):
+  release = threading.Event()
+  fixture.repo = FakeConfigRepo([fixture.rule("rule", Now)])
+  def executeRule(rule):
+    fixture.executeRule(rule)
+    release.wait(1)
+
+  daemon = fixture.construct(executeRule)
+  daemon.runDueRules()
+  daemon.runDueRules()
+  release.set()
+  daemon._executor.shutdown(wait=True)
+
+  assert fixture.executedRules == ["rule"]
+
+def test_shouldReloadTheExecutionsOfEachRuleOnEveryPass(fixture):
+  rule = fixture.rule("rule", Now + timedelta(minutes=1))
+  fixture.repo = FakeConfigRepo([rule])
+  daemon = fixture.construct()
+
+  daemon.runDueRules()
+  daemon.runDueRules()
+  assert rule.forgottenExecutions == 2
+
+def test_shouldWaitForTheNextPassIfTheRuleIsLockedByAnotherProcess(fixture):
+  fixture.repo = FakeConfigRepo([fixture.rule("rule", Now)])
+  def executeRule(rule):
+    fixture.executeRule(rule)
+    raise LockException()
+  fixture.errorLogger.expectCalls(mock.callMatching("log",
+    lambda *args, **kwargs: "rule" in args and "lock" in args[0]))
+
+  daemon = fixture.construct(executeRule)
+  daemon.runDueRules()
+  assert fixture.executionDone.wait(1)
+  for _ in range(100):
+    if len(daemon._runningRuleNames) == 0:
+      break
+    time.sleep(0.01)
+
+  fixture.errorLogger.checkExpectedCalls()
+  assert not daemon._wakeUp.is_set()
+  fixture.executionDone.clear()
+  daemon.runDueRules()
+  assert fixture.executionDone.wait(1)
+
+def test_shouldGiveTheHooksOfRulesRunningAtOnceTheirOwnRuleName(fixture):
+  fixture.repo = FakeConfigRepo([fixture.rule("first", Now), 
+    fixture.rule("second", Now)])
+  outputs = dict()
+  bothRunning = threading.Barrier(2, timeout=1)
+  def executeRule(rule):
+    outputs[rule.name] = BufferingLogger()
+    execEnv = execEnvironment(logger=outputs[rule.name],
+        logSubProcessWith=logSubProcess)
+    bothRunning.wait()
+    execEnv.logSubProcess('sleep 0.1; echo "$SIBT_RULE"', shell=True,
+        environmentVars=dict(SIBT_RULE=rule.name))
+
+  daemon = fixture.construct(executeRule)
+  daemon.runDueRules()
+  daemon._executor.shutdown(wait=True)
+
+  assert outputs["first"].buffer == b"first\n"
+  assert outputs["second"].buffer == b"second\n"
+  assert "SIBT_RULE" not in os.environ
+
+def test_shouldReloadTheConfigurationOnlyIfTheConfigFilesChanged(fixture):
+  daemon = fixture.construct()
+  daemon.runDueRules()
+  daemon.runDueRules()
+  assert len(fixture.loadedRepos) == 1
+
+  fixture.stamp = 2
+  fixture.repo = FakeConfigRepo([fixture.rule("new", Now)])
+  daemon.runDueRules()
+  assert len(fixture.loadedRepos) == 2
+  assert fixture.executionDone.wait(1)
+  assert fixture.executedRules == ["new"]
+
+def test_shouldKeepThePreviousConfigurationIfReloadingFails(fixture):
+  fixture.repo = FakeConfigRepo([fixture.rule("rule", Now + timedelta(
+    seconds=10))])
+  daemon = fixture.construct()
+  daemon.runDueRules()
+
+  def failToLoad():
+    raise Exception("syntax error")
+  daemon._loadConfigRepo = failToLoad
+  fixture.stamp = 2
+  fixture.errorLogger.expectCalls(mock.callMatching("log",
+    lambda *args, **kwargs: "syntax error" in args[1:]))
+
+  assert daemon.runDueRules() == 10
+  fixture.errorLogger.checkExpectedCalls()
+
+def test_shouldApplyChangesReportedByTheWatcherInsteadOfReloading(fixture):
+  watcher = FakeWatcher()
+  fixture.repo = FakeConfigRepo([], canApplyChanges=True)
+  daemon = fixture.construct(watcher=watcher)
+  daemon._collectChanges = lambda: None
+  daemon.runDueRules()
+
+  daemon._changedFiles = [("/rules", "foo")]
+  daemon.runDueRules()
+  assert fixture.repo.appliedChanges == [("/rules", "foo")]
+  assert len(fixture.loadedRepos) == 1
+
+  fixture.repo.canApplyChanges = False
+  daemon._changedFiles = [("/runners", "bar")]
+  daemon.runDueRules()
+  assert len(fixture.loadedRepos) == 2
+
+def test_shouldLogFailedChangesAndReloadEverythingInstead(fixture):
+  class BrokenRepo(FakeConfigRepo):
+    def applyChanges(self, changedFiles):
+      raise Exception("no such rule")
+
+  fixture.repo = BrokenRepo([])
+  daemon = fixture.construct(watcher=FakeWatcher())
+  daemon._collectChanges = lambda: None
+  daemon.runDueRules()
+
+  fixture.errorLogger.expectCalls(mock.callMatching("log",
+    lambda *args, **kwargs: "no such rule" in args[1:]))
+  daemon._changedFiles = [("/rules", "foo")]
+  daemon.runDueRules()
+  fixture.errorLogger.checkExpectedCalls()
+  assert len(fixture.loadedRepos) == 2
+
+def test_shouldFallBackToComparingConfigFilesIfTheWatcherFails(fixture):
+  class BrokenWatcher(object):
+    def waitForChanges(self):
+      raise OSError("inotify queue overflow")
+
+  daemon = fixture.construct(watcher=BrokenWatcher())
+  daemon.runDueRules()
+  fixture.errorLogger.expectCalls(mock.callMatching("log",
+    lambda *args, **kwargs: "inotify queue overflow" in args[1:]))
+  daemon._collectChanges()
+  fixture.errorLogger.checkExpectedCalls()
+  assert daemon._wakeUp.is_set()
+
+  daemon.runDueRules()
+  assert len(fixture.loadedRepos) == 1
+  fixture.stamp = 2
+  daemon.runDueRules()
+  assert len(fixture.loadedRepos) == 2
+
+def test_shouldReportRulesThatCantBeLoadedOnceAndExecuteTheOthers(fixture):
+  class BrokenRepo(FakeConfigRepo):
+    def getSyncRule(self, name):
+      if name == "broken":
+        raise Exception("syntax error")
+      return super().getSyncRule(name)
+
+  fixture.repo = BrokenRepo([fixture.rule("broken"), fixture.rule("fine",
+    Now)])
+  fixture.errorLogger.expectCalls(mock.callMatching("log",
+    lambda *args, **kwargs: "broken" in args[1:]))
+  daemon = fixture.construct()
+  daemon.runDueRules()
+  fixture.stamp = 1
+  assert fixture.executionDone.wait(1)
+  daemon.runDueRules()
+
+  fixture.errorLogger.checkExpectedCalls()
+  assert fixture.executedRules == ["fine"]
+
+def test_shouldDetectChangedAddedAndRemovedConfigFiles(tmpdir):
+  configDir = tmpdir.mkdir("rules")
+  stamp = configFilesStamp([str(configDir), str(tmpdir / "non-existent")])
+
+  configDir.join("rule").write("a")
+  assert configFilesStamp([str(configDir), str(tmpdir / "non-existent")]) != \
+      stamp
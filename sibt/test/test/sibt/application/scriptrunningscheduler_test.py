@@ -19,7 +19,8 @@ from sibt.application.scriptrunningscheduler import ScriptRunningScheduler
 from test.sibt.application.intermediateschedulertest import \
     IntermediateSchedulerTestFixture
 from test.common.bufferinglogger import BufferingLogger
-from test.common.builders import mockSched, buildScheduling, execEnvironment
+from test.common.builders import mockSched, buildScheduling, \
+    execEnvironment, schedulingSet
 from test.common.assertutil import strToTest, iterToTest
 from test.common import mock
 import os
@@ -44,6 +45,7 @@ class Fixture(IntermediateSchedulerTestFixture):
   def __init__(self):
     self.callsMock = mock.mock()
     self.logger = BufferingLogger()
+    self.cacheDir = None
 
   def _callMatcher(self, expectedProgram, expectedEnvVars,
       program, environmentVars=None, **kwargs):
@@ -83,7 +85,7 @@ class Fixture(IntermediateSchedulerTestFixture):
     return ret
 
   def construct(self, wrappedSched):
-    return ScriptRunningScheduler(wrappedSched)
+    return ScriptRunningScheduler(wrappedSched, self.cacheDir)
   
   def execute(self, execs, ruleName=None):
     execEnv = execEnvironment(
@@ -193,3 +195,59 @@ def test_shouldReturnTheWrappedSchedsCheckErrors(fixture):
         lambda error: "ExecOnSuccess" in error,
         lambda error: error == "foo",
         lambda error: error == "bar")
+
+def test_shouldRememberTheSyntaxCheckResultsOfUnchangedScripts(fixture,
+    tmpdir):
+  fixture.cacheDir = str(tmpdir / "cache")
+  schedulings = [buildScheduling("a", ExecBefore="("),
+      buildScheduling("b", ExecBefore="true")]
+  errors = fixture.check(schedulings)
+  assert len(errors) == 1
+
+  def failIfRun(codes):
+    assert codes == ["false"]
+    return [""]
+  scheduler = fixture.makeSched()
+  scheduler._runSyntaxChecks = failIfRun
+  assert scheduler.check(schedulingSet(schedulings)) == errors
+  assert scheduler.check(schedulingSet(
+    [buildScheduling("c", ExecBefore="false")])) == []
+
+def test_shouldCheckTheSyntaxOfEachDistinctScriptOnlyOnceInABatch(fixture):
+  checkedScripts = []
+  scheduler = fixture.makeSched()
+  runSyntaxChecks = scheduler._runSyntaxChecks
+  def recordingCheck(codes):
+    checkedScripts.append(codes)
+    return runSyntaxChecks(codes)
+  scheduler._runSyntaxChecks = recordingCheck
+
+  schedulings = [buildScheduling(str(i), ExecBefore="echo 1",
+    ExecOnSuccess="echo {0}".format(i % 3)) for i in range(10)]
+  assert scheduler.check(schedulingSet(schedulings)) == []
+  assert len(checkedScripts) == 1
+  assert sorted(checkedScripts[0]) == ["echo 0", "echo 1", "echo 2"]
+
+  schedulings[7] = buildScheduling("broken", ExecOnFailure="(", 
+      ExecBefore="echo 3", ExecOnSuccess="echo 4")
+  iterToTest(scheduler.check(schedulingSet(schedulings))).\
+      shouldContainMatching(lambda error: strToTest(error).shouldInclude(
+        "ExecOnFailure", "broken", "unexpected"))
+
+def test_shouldFindSyntaxErrorsOfScriptsThatWouldCancelEachOtherOut(fixture):
+  schedulings = [buildScheduling("first", ExecBefore='echo "a'),
+      buildScheduling("second", ExecBefore='echo "b')]
+
+  iterToTest(fixture.check(schedulings)).shouldContainMatching(
+      lambda error: strToTest(error).shouldInclude("ExecBefore", "first"),
+      lambda error: strToTest(error).shouldInclude("ExecBefore", "second"))
+
+def test_shouldNotRunAnythingOfScriptsWithUnbalancedBraces(fixture,
+    tmpdir):
+  flagFile = str(tmpdir / "flag")
+  errors = fixture.check([buildScheduling(
+    ExecBefore="true; }}; touch {0}; {{ true".format(flagFile)),
+    buildScheduling(ExecBefore="echo ok")])
+
+  assert len(errors) == 1
+  assert not os.path.isfile(flagFile)
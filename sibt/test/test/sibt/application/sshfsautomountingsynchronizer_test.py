@@ -27,15 +27,17 @@ from test.common import execmock
 from sibt.infrastructure import types
 from sibt.application.sshfsautomountingsynchronizer import \
     SSHFSAutoMountingSynchronizer, isExtensible
+from sibt.application.sshfsmountpool import SSHFSMountPool
 from test.integration.synchronizers.synchronizertest import \
     SynchronizerTestFixture
 
 class Fixture(SynchronizerTestFixture):
-  def init(self, ports, availableOptions=[]):
+  def init(self, ports, availableOptions=[], mountPool=None):
     wrapped = mockSyncer(availableOptions=availableOptions, ports=ports)
     self.wrapped = wrapped
     self.processRunner = LoggingProcessRunner()
-    self.syncer = SSHFSAutoMountingSynchronizer(wrapped, self.processRunner)
+    self.syncer = SSHFSAutoMountingSynchronizer(wrapped, self.processRunner,
+        mountPool)
 
   def call(self, funcName, testOptions, inputOptions):
     returnValue = object()
@@ -116,3 +118,22 @@ def test_shouldUnmountAndCleanUpMountDirsEvenIfAnExceptionIsThrown(fixture):
 
   for locPath in newLocPaths:
     assert not os.path.lexists(locPath)
+
+def test_shouldReuseTheMountsOfASharedPoolAcrossCalls(fixture):
+  processRunner = LoggingProcessRunner()
+  pool = SSHFSMountPool(processRunner)
+  options = dict(Loc1=sshLocation(path="/foo"), Loc2=localLocation("/bar"))
+  fixture.init(TwoFilePorts, mountPool=pool)
+
+  mountPaths = []
+  def testOptions(newOptions):
+    mountPaths.append(newOptions["Loc1"].path)
+
+  fixture.call("versionsOf", testOptions, options)
+  fixture.call("listFiles", testOptions, options)
+  assert mountPaths[0] == mountPaths[1]
+  assert os.path.isdir(mountPaths[0])
+  assert len(processRunner.executions) == 1
+
+  pool.close()
+  assert not os.path.lexists(mountPaths[0])
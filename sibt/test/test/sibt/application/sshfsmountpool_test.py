@@ -0,0 +1,181 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+import os
+import shutil
+import threading
+import time
+
+from test.common.assertutil import FakeException
+from test.common.builders import sshLocation
+from sibt.application.sshfsmountpool import SSHFSMountPool
+
+class LoggingProcessRunner(object):
+  def __init__(self):
+    self.executions = []
+
+  def execute(self, *args, **kwargs):
+    self.executions.append(args)
+
+  def programsCalled(self):
+    return [execution[0] for execution in self.executions]
+
+class BlockingProcessRunner(LoggingProcessRunner):
+  def __init__(self, blockedHost):
+    super().__init__()
+    self.blockedHost = blockedHost
+    self.unblock = threading.Event()
+
+  def execute(self, *args, **kwargs):
+    super().execute(*args, **kwargs)
+    if args[0] == "sshfs" and any(self.blockedHost in arg for arg in args):
+      assert self.unblock.wait(5)
+
+class Fixture(object):
+  def __init__(self):
+    self.processRunner = LoggingProcessRunner()
+
+  def makePool(self, idleTimeout=None):
+    return SSHFSMountPool(self.processRunner, idleTimeout)
+
+@pytest.fixture
+def fixture():
+  return Fixture()
+
+def test_shouldMountEachDistinctRemoteLocationOnceUntilItIsClosed(fixture):
+  pool = fixture.makePool()
+  loc = sshLocation(host="host", path="/foo")
+
+  mountPoint = pool.acquire(loc, None)
+  assert os.path.isdir(mountPoint)
+  pool.release(loc, None)
+  assert pool.acquire(sshLocation(host="host", path="/foo"), None) == \
+      mountPoint
+  assert pool.acquire(loc, "ssh -i key") != mountPoint
+  assert pool.acquire(sshLocation(host="host", path="/bar"), None) != \
+      mountPoint
+  assert fixture.processRunner.programsCalled() == ["sshfs"] * 3
+
+  pool.close()
+  assert fixture.processRunner.programsCalled() == ["sshfs"] * 3 + \
+      ["fusermount"] * 3
+  assert not os.path.lexists(mountPoint)
+
+def test_shouldUnmountAsSoonAsAMountIsNoLongerUsedIfTheTimeoutIsZero(
+    fixture):
+  pool = fixture.makePool(idleTimeout=0)
+  loc = sshLocation(path="/foo")
+
+  mountPoint = pool.acquire(loc, None)
+  pool.acquire(loc, None)
+  pool.release(loc, None)
+  assert os.path.isdir(mountPoint)
+  pool.release(loc, None)
+  assert not os.path.lexists(mountPoint)
+
+def test_shouldUnmountIdleMountsAfterTheTimeoutUnlessTheyAreReusedBefore(
+    fixture):
+  pool = fixture.makePool(idleTimeout=0.05)
+  loc = sshLocation(path="/foo")
+
+  mountPoint = pool.acquire(loc, None)
+  pool.release(loc, None)
+  assert pool.acquire(loc, None) == mountPoint
+  time.sleep(0.1)
+  assert os.path.isdir(mountPoint)
+
+  pool.release(loc, None)
+  for _ in range(100):
+    if not os.path.lexists(mountPoint):
+      break
+    time.sleep(0.01)
+  assert not os.path.lexists(mountPoint)
+  assert fixture.processRunner.programsCalled() == ["sshfs", "fusermount"]
+
+def test_shouldUnmountAllMountsOnCloseEvenIfSomeUnmountingFails(fixture):
+  pool = fixture.makePool()
+  firstMountPoint = pool.acquire(sshLocation(path="/foo"), None)
+  secondMountPoint = pool.acquire(sshLocation(path="/bar"), None)
+
+  def failOnce(*args, **kwargs):
+    fixture.processRunner.execute = LoggingProcessRunner().execute
+    raise FakeException()
+  fixture.processRunner.execute = failOnce
+
+  with pytest.raises(FakeException):
+    pool.close()
+  remainingMountPoints = [mountPoint for mountPoint in
+      [firstMountPoint, secondMountPoint] if os.path.lexists(mountPoint)]
+  assert len(remainingMountPoints) == 1
+  shutil.rmtree(os.path.dirname(remainingMountPoints[0]))
+
+def test_shouldMountOtherLocationsWhileAMountIsInProgress(fixture):
+  fixture.processRunner = BlockingProcessRunner("slow-host")
+  pool = fixture.makePool()
+  slowLoc = sshLocation(host="slow-host", path="/foo")
+  mountPoints = []
+  def acquireSlowLoc():
+    mountPoints.append(pool.acquire(slowLoc, None))
+
+  threads = [threading.Thread(target=acquireSlowLoc) for _ in range(2)]
+  for thread in threads:
+    thread.start()
+  pool.acquire(sshLocation(host="fast-host", path="/foo"), None)
+  assert mountPoints == []
+
+  fixture.processRunner.unblock.set()
+  for thread in threads:
+    thread.join()
+  assert len(set(mountPoints)) == 1
+  assert fixture.processRunner.programsCalled() == ["sshfs"] * 2
+  pool.close()
+
+def test_shouldPassMountErrorsOnToEveryoneWaitingForTheMount(fixture):
+  pool = fixture.makePool()
+  loc = sshLocation(path="/foo")
+  mountStarted = threading.Event()
+  mayFail = threading.Event()
+  def failToMount(*args, **kwargs):
+    mountStarted.set()
+    assert mayFail.wait(5)
+    raise FakeException()
+  fixture.processRunner.execute = failToMount
+
+  errors = []
+  def acquire():
+    try:
+      pool.acquire(loc, None)
+    except FakeException as ex:
+      errors.append(ex)
+  threads = [threading.Thread(target=acquire) for _ in range(2)]
+  threads[0].start()
+  assert mountStarted.wait(5)
+  threads[1].start()
+  for _ in range(100):
+    if pool._mounts[pool._keyOf(loc, None)].refCount == 2:
+      break
+    time.sleep(0.01)
+  mayFail.set()
+  for thread in threads:
+    thread.join()
+
+  assert len(errors) == 2
+  assert len(pool._mounts) == 0
+  fixture.processRunner.execute = LoggingProcessRunner().execute
+  assert os.path.isdir(pool.acquire(loc, None))
+  pool.close()
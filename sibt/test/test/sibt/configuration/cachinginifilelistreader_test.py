@@ -17,6 +17,7 @@
 from sibt.configuration.exceptions import ConfigSyntaxException, \
     MissingConfigValuesException
 import pytest
+import os
 from test.common.assertutil import iterToTest
 from sibt.configuration.cachinginifilelistreader import CachingIniFileListReader
 
@@ -166,3 +167,23 @@ def test_shouldProvideAccessToTheInstanceArgument(fixture):
   assert fixture.sectionsOf("foo", instanceArgument="the-value")["c"] == \
       { "Target": "/var/local/vms/the-value.img" }
 
+
+def test_shouldReadAnIncludeFileSharedByManyRulesOnlyOnce(fixture):
+  include = fixture.writeFile("shared.inc", "[c]\nOpt = %(_instanceName)s")
+  fixture.writeFile("rule1", "#import shared")
+  fixture.writeFile("rule2", "#import shared")
+
+  assert fixture.sectionsOf("rule1", instanceArgument="a")["c"] == \
+      { "Opt": "a" }
+  os.remove(include)
+  assert fixture.sectionsOf("rule2", instanceArgument="b")["c"] == \
+      { "Opt": "b" }
+
+def test_shouldThrowExceptionIfImportsAreCyclic(fixture):
+  fixture.writeFile("first.inc", "#import second")
+  fixture.writeFile("second.inc", "#import first")
+  fixture.writeFile("rule", "#import first")
+
+  with pytest.raises(ConfigSyntaxException) as ex:
+    fixture.sectionsOf("rule")
+  assert "cyclic" in str(ex.value)
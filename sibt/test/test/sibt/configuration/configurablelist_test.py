@@ -44,3 +44,21 @@ def test_shouldLoadAllWhenIterating():
   assert set(confList) == { 1, 2 }
   x[0] = 5
   assert set(confList) == { 1, 2 }
+
+def test_shouldRescanAndForgetTheLoadedStateOfConfigurablesWhenReloaded():
+  version = [1]
+  scanned = [["foo", "bar"]]
+  def rescan():
+    return [LazyConfigurable(name, lambda name=name: (name, version[0])) for
+        name in scanned[0]]
+
+  confList = ConfigurableList(rescan(), rescan)
+  assert set(confList) == { ("foo", 1), ("bar", 1) }
+
+  version[0] = 2
+  scanned[0] = ["foo", "quux"]
+  confList.reload(["foo", "quux"])
+  assert set(confList) == { ("foo", 2), ("bar", 1), ("quux", 2) }
+
+  confList.reload()
+  assert set(confList) == { ("foo", 2), ("quux", 2) }
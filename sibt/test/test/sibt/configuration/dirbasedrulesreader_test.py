@@ -189,3 +189,38 @@ def test_shouldReturnNameAndBasicInfoOfRulesEvenWithoutBuildingThem(fixture):
       lambda rule: rule.name == "foo" and not rule.enabled,
       lambda rule: rule.name == "bar" and rule.enabled)
 
+
+def test_shouldFindTheSameRuleByNameWithoutReadingAllOfThem(fixture):
+  fixture.writeAnyRule("base")
+  fixture.writeAnyRule("other")
+  fixture.writeAnyRule("disabled")
+  fixture.writeAnyRule("common.inc")
+  fixture.writeInstanceFile("inst@base")
+  fixture.writeInstanceFile("@other")
+  fixture.writeInstanceFile(".hidden@base")
+
+  fileReader = mock.mock()
+  fileReader.sectionsFromFiles = lambda paths, instanceArgument: \
+      sectionsDict(ruleOpts=(tuple(paths), instanceArgument))
+  fixture.factory.readRule = lambda name, ruleOpts, _, __, isEnabled: \
+      (name, ruleOpts, isEnabled)
+  reader = fixture._createReader("", fileReader)
+
+  allRules = dict((lazyRule.name, lazyRule.load()) for lazyRule in 
+      reader.read())
+  for name in ["inst@base", "other", "disabled"]:
+    lazyRules = reader.readByName(name)
+    assert [lazyRule.load() for lazyRule in lazyRules] == [allRules[name]]
+
+  for name in ["base", "common.inc", ".hidden@base", "foo", "x@base", 
+      "../rules/base"]:
+    assert reader.readByName(name) == []
+
+def test_shouldNotChooseBetweenBaseRulesIfTheNameIsAmbiguous(fixture):
+  fixture.writeAnyRule("c")
+  fixture.writeAnyRule("b@c")
+  fixture.writeInstanceFile("a@b@c")
+
+  reader = fixture._createReader("")
+  assert reader.readByName("a@b@c") is None
+  assert reader.readByName("b@c") == []
@@ -0,0 +1,70 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from test.common import mock
+from sibt.configuration.cachinginifilelistreader import CachingIniFileListReader
+from sibt.configuration.diskcachinginifilelistreader import \
+    DiskCachingIniFileListReader
+
+class Fixture(object):
+  def __init__(self, tmpdir):
+    self.rulesDir = tmpdir.mkdir("rules")
+    self.includeDir = tmpdir.mkdir("include")
+    self.cacheDir = str(tmpdir.join("cache"))
+
+  def construct(self, wrapped=None):
+    return DiskCachingIniFileListReader(wrapped or CachingIniFileListReader(
+      [str(self.rulesDir), str(self.includeDir)], ["a"]), self.cacheDir)
+
+  def sectionsOf(self, reader, *names, instanceArgument=None):
+    return reader.sectionsFromFiles([str(self.rulesDir.join(name)) for name in
+      names], instanceArgument)
+
+@pytest.fixture
+def fixture(tmpdir):
+  return Fixture(tmpdir)
+
+def test_shouldReturnTheSectionsOfUnchangedFilesWithoutParsingThemAgain(
+    fixture):
+  fixture.includeDir.join("base.inc").write("[a]\nFoo = %(_instanceName)s")
+  fixture.rulesDir.join("rule").write("#import base\n[a]\nBar = 1")
+
+  expectedSections = { "a": { "Foo": "inst", "Bar": "1" }, "Global": {} }
+  assert fixture.sectionsOf(fixture.construct(), "rule",
+      instanceArgument="inst") == expectedSections
+  assert fixture.sectionsOf(fixture.construct(mock.mock()), "rule",
+      instanceArgument="inst") == expectedSections
+
+  assert fixture.sectionsOf(fixture.construct(), "rule",
+      instanceArgument="other")["a"]["Foo"] == "other"
+
+def test_shouldReparseIfAnyImportedFileChanges(fixture):
+  includeFile = fixture.includeDir.join("base.inc")
+  includeFile.write("[a]\nFoo = 1")
+  fixture.rulesDir.join("rule").write("#import base")
+
+  assert fixture.sectionsOf(fixture.construct(), "rule")["a"] == { "Foo": "1" }
+  includeFile.write("[a]\nFoo = 22")
+  assert fixture.sectionsOf(fixture.construct(), "rule")["a"] == { "Foo": "22" }
+
+def test_shouldReparseIfAnImportedFileBecomesShadowedByAnotherOne(fixture):
+  fixture.includeDir.join("base.inc").write("[a]\nFoo = 1")
+  fixture.rulesDir.join("rule").write("#import base")
+
+  assert fixture.sectionsOf(fixture.construct(), "rule")["a"] == { "Foo": "1" }
+  fixture.rulesDir.join("base.inc").write("[a]\nFoo = 2")
+  assert fixture.sectionsOf(fixture.construct(), "rule")["a"] == { "Foo": "2" }
@@ -23,6 +23,8 @@ from test.common.validatortest import fix, ValidatorTest, schedCallWithRules
 from test.common.builders import mockSched, optInfo, mockRule, ruleSet
 from test.common.assertutil import iterToTest, strToTest, stringThat
 from sibt.domain.syncrule import LocCheckLevel
+from sibt.configuration.optionvaluesparser import parseLocation
+from sibt.infrastructure.parallelmapper import ParallelMapper
 
 class Test_SynchronizerCheckValidatorTest(ValidatorTest):
   def construct(self):
@@ -40,6 +42,17 @@ class Test_SynchronizerCheckValidatorTest(ValidatorTest):
             stringThat.shouldInclude("Contradictory", "second", "syncer2"),
             stringThat.shouldInclude("Unreadable", "second", "syncer2"))
 
+  def test_shouldMergeTheErrorsOfChecksRunInParallelInRuleOrder(self, fix):
+    rules = [mockRule(str(i), syncerCheckErrors=["error {0}".format(i)])
+        for i in range(5)]
+    mapper = ParallelMapper(5)
+    mapFunc = lambda func, xs: list(mapper.map(func, xs))
+
+    assert SynchronizerCheckValidator(mapFunc).validate(ruleSet(*rules)) == \
+        SynchronizerCheckValidator().validate(ruleSet(*rules))
+    strToTest(SynchronizerCheckValidator(mapFunc).validate(
+      ruleSet(*rules))[4]).shouldInclude("‘4’", "error 4")
+
 class Test_SchedulerCheckValidatorTest(ValidatorTest):
   def construct(self):
     return SchedulerCheckValidator()
@@ -159,6 +172,39 @@ class Test_NoOverlappingWritesValidator(ValidatorTest):
         fix.mockRule("/src/1", "/dest/1"),
         fix.mockRule("/dest/1", "/dest/2", writeLocs=[1,2])])) == 1
 
+  def test_shouldReportTheSameOverlapsAsComparingEachPairOfLocs(self, fix):
+    fix.tmpdir.mkdir("real").mkdir("sub")
+    fix.tmpdir.join("link").mksymlinkto(fix.tmpdir.join("real"))
+    def local(path):
+      return str(fix.tmpdir) + path
+
+    locLists = [
+        [local("/real/sub"), local("/other")],
+        [local("/link/")],
+        [local("/link"), local("/other/x")],
+        ["ssh://host/mnt", "ftp://host/mnt/a"],
+        ["sftp://host/mnt/b/c", "ssh://host2/mnt/b"],
+        ["ssh://foo@host/~/dir", "ftp://host:22/~/dir/d"],
+        ["scp://foo@host/~/dir/e", "ssh://host/~/dir"]]
+    rules = []
+    for locs in locLists:
+      rule = fix.mockRule("/src", "/dest")
+      rule.writeLocs = [parseLocation(loc) for loc in locs]
+      rules.append(rule)
+
+    expectedErrors = []
+    for i, rule1 in enumerate(rules):
+      for rule2 in rules[i+1:]:
+        for loc1 in rule1.writeLocs:
+          for loc2 in rule2.writeLocs:
+            if loc1.contains(loc2) or loc2.contains(loc1):
+              expectedErrors.append("in ‘{0}’, ‘{1}’: ‘{2}’, ‘{3}’: "
+                  "overlapping writes".format(rule1.name, rule2.name, loc1,
+                    loc2))
+
+    assert len(expectedErrors) == 6
+    assert self.construct().validate(rules) == expectedErrors
+
 class Test_NoSourceDirOverwriteValidator(ValidatorTest):
   def construct(self):
     return NoSourceDirOverwriteValidator()
@@ -15,12 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pytest
+import contextlib
 from test.common import mock
 from sibt.domain.syncrule import SyncRule
 from datetime import datetime, timedelta, timezone
 from test.common.builders import remoteLocation, location, version, port, \
   mockSyncer, mkSyncerOpts, orderedDateTimes, execution, anyUTCDateTime, \
-  mockSched
+  mockSched, execEnvironment, constantTimeClock
 from sibt.domain.exceptions import UnsupportedProtocolException, \
     UnstablePhaseException
 from sibt.domain.negativeunstablephasedetector import \
@@ -33,6 +34,17 @@ class MockExecutionsLog(object):
   def executionsOfRules(self, ruleNames):
     return dict((name, self.executions) for name in ruleNames)
 
+  def latestExecutionsOfRules(self, ruleNames, count):
+    return dict((name, self.executions[-count:]) for name in ruleNames)
+
+  def logExecution(self, ruleName, clock, executionFunc):
+    self.executions = self.executions + [execution(endTime=clock.now())]
+
+def unlockedMutexManager():
+  ret = mock.mock()
+  ret.lockForId = lambda _: contextlib.suppress()
+  return ret
+
 class PositiveUnstablePhaseDetector(object):
   def isInUnstablePhase(self, ruleToTest):
     return True
@@ -49,7 +61,7 @@ class Fixture(object):
 
   def ruleWith(self, name="some-rule", scheduler=None,
       mockedSynchronizer=None, schedOptions={}, 
-      syncerOptions=mkSyncerOpts()):
+      syncerOptions=mkSyncerOpts(), options={}):
     if mockedSynchronizer is None:
       mockedSynchronizer = mockSyncer()
 
@@ -57,7 +69,7 @@ class Fixture(object):
       syncerOptions["Loc1"] = location("/mnt")
     if "Loc2" not in syncerOptions:
       syncerOptions["Loc2"] = location("/etc")
-    return SyncRule(name, {}, schedOptions, syncerOptions, 
+    return SyncRule(name, options, schedOptions, syncerOptions, 
         False, scheduler, mockedSynchronizer, self.log)
 
 @pytest.fixture
@@ -204,6 +216,33 @@ def test_shouldReturnItsLastNotRunningLoggedExecutionIfItExists(fixture):
   fixture.log.executions = [first, latest, running]
   assert rule().lastFinishedExecution == latest
 
+def test_shouldNotUseCachedExecutionsAnymoreAfterItExecuted(fixture):
+  lastEndTime, newEndTime = orderedDateTimes(2)
+  fixture.log.executions = [execution(endTime=lastEndTime)]
+  rule = fixture.ruleWith()
+  assert rule.lastExecutionTime == lastEndTime
+
+  rule.execute(execEnvironment(), constantTimeClock(newEndTime),
+      unlockedMutexManager(), mock.mock())
+
+  assert rule.lastExecutionTime == newEndTime
+
+def test_shouldLogFailuresToRemoveExpiredLogsWithoutFailingTheExecution(
+    fixture):
+  fixture.log.executions = []
+  def failToRemove(ruleName, retentionPolicy, now):
+    raise OSError("disk full")
+  fixture.log.removeExpiredExecutions = failToRemove
+  rule = fixture.ruleWith(name="rule", options=dict(KeepLogs=1))
+
+  errorLogger = mock.mock()
+  errorLogger.expectCalls(mock.callMatching("log", lambda *args, **kwargs:
+    "rule" in args and "disk full" in args))
+  rule.execute(execEnvironment(), constantTimeClock(anyUTCDateTime()),
+      unlockedMutexManager(), errorLogger)
+  errorLogger.checkExpectedCalls()
+  assert rule.lastExecutionTime is not None
+
 def test_shouldBeAbleToPredictItsNextExecutionWithHelpOfTheScheduler(fixture):
   lastEndTime, nextTime = orderedDateTimes(2)
   sched = mockSched()
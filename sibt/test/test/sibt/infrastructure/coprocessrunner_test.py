@@ -114,3 +114,26 @@ def test_shouldCallFuncsAfterForkingANewProcessAndAfterItsTermination(fixture,
   shouldOutputInCorrectOrder(runner.execute, 0)
   raiseException = True
   shouldOutputInCorrectOrder(runner.getOutput, 5)
+
+def test_shouldOnlyStartServersForProgramsThatSpeakTheServerProtocol(fixture):
+  assert fixture.runner.startServer(fixture.writeBashExecutable("exit 0")) \
+      is None
+
+  server = fixture.runner.startServer(fixture.writeBashExecutable(r"""
+    printf 'ready\0'
+    while IFS= read -r -d '' fieldCount; do
+      : >"$2"
+      for ((i = 0; i < fieldCount; ++i)); do
+        IFS= read -r -d '' field
+        echo "$field" >>"$2"
+      done
+      printf '%s\0' "$([ "$field" = fail ] && echo 4 || echo 0)"
+    done"""))
+  try:
+    assert server.getOutput("foo", "bar") == ["foo", "bar"]
+    assert server.getOutput("baz") == ["baz"]
+    with pytest.raises(ExternalFailureException) as ex:
+      server.getOutput("fail")
+    assert ex.value.exitStatus == 4
+  finally:
+    server.close()
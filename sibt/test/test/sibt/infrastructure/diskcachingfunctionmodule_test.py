@@ -0,0 +1,146 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from test.common import mock
+from sibt.infrastructure.diskcachingfunctionmodule import \
+    DiskCachingFunctionModule
+from sibt.infrastructure.exceptions import \
+    ModuleFunctionNotImplementedException
+
+class Fixture(object):
+  def __init__(self, tmpdir):
+    self.tmpdir = tmpdir
+    self.syncerFile = tmpdir.join("syncer")
+    self.syncerFile.write("#!runner\n")
+    self.runnerFile = tmpdir.join("runner")
+    self.runnerFile.write("")
+    self.cacheFile = tmpdir.join("cache", "syncer")
+
+  def construct(self):
+    wrapped = mock.mock()
+    return wrapped, DiskCachingFunctionModule(wrapped, str(self.cacheFile),
+        [str(self.syncerFile), str(self.runnerFile)])
+
+@pytest.fixture
+def fixture(tmpdir):
+  return Fixture(tmpdir)
+
+def fuzzyCall(funcName, args, ret):
+  return mock.call("callFuzzy", (funcName, args, {}), ret=ret)
+
+def test_shouldAnswerMetadataCallsOfLaterInstancesFromTheCacheFile(fixture):
+  wrapped, module = fixture.construct()
+  wrapped.expectCalls(fuzzyCall("info-of-port", ["1"], ["0", "file"]))
+  assert module.callFuzzy("info-of-port", ["1"], {}) == ["0", "file"]
+  assert module.callFuzzy("info-of-port", ["1"], {}) == ["0", "file"]
+  wrapped.checkExpectedCalls()
+
+  _, newModule = fixture.construct()
+  assert newModule.callFuzzy("info-of-port", ["1"], {}) == ["0", "file"]
+
+def test_shouldRememberIfAFunctionIsNotImplemented(fixture):
+  def throwNotImplementedEx():
+    raise ModuleFunctionNotImplementedException("describe")
+
+  wrapped, module = fixture.construct()
+  wrapped.expectCalls(mock.call("callFuzzy", ("describe", [], {}),
+    sideEffectFunc=throwNotImplementedEx))
+  with pytest.raises(ModuleFunctionNotImplementedException):
+    module.callFuzzy("describe", [], {})
+  wrapped.checkExpectedCalls()
+
+  _, newModule = fixture.construct()
+  with pytest.raises(ModuleFunctionNotImplementedException):
+    newModule.callFuzzy("describe", [], {})
+
+@pytest.mark.parametrize("changedFileName", ["syncerFile", "runnerFile"])
+def test_shouldInvalidateTheCacheIfTheSynchronizerOrItsRunnerChanges(fixture,
+    changedFileName):
+  wrapped, module = fixture.construct()
+  wrapped.expectCalls(fuzzyCall("available-options", [], ["Old"]))
+  assert module.callFuzzy("available-options", [], {}) == ["Old"]
+
+  getattr(fixture, changedFileName).write("echo changed")
+
+  wrapped, module = fixture.construct()
+  wrapped.expectCalls(fuzzyCall("available-options", [], ["New"]))
+  assert module.callFuzzy("available-options", [], {}) == ["New"]
+  wrapped.checkExpectedCalls()
+
+def test_shouldNotCacheOtherFunctions(fixture):
+  wrapped, module = fixture.construct()
+  wrapped.expectCalls(
+      mock.call("callFuzzy", ("versions-of", ["/a", "1"], {"A": "b"}),
+        ret=["1"]),
+      mock.call("callFuzzy", ("versions-of", ["/a", "1"], {"A": "b"}),
+        ret=["2"]))
+
+  assert module.callFuzzy("versions-of", ["/a", "1"], {"A": "b"}) == ["1"]
+  assert module.callFuzzy("versions-of", ["/a", "1"], {"A": "b"}) == ["2"]
+  wrapped.checkExpectedCalls()
+
+def test_shouldReuseCheckResultsForAShortTimeAsLongAsTheLocsAreUnchanged(
+    fixture):
+  now = [1000]
+  loc = fixture.tmpdir.mkdir("loc")
+  options = { "Loc1Protocol": "file", "Loc1Path": str(loc), "DryRun": "1" }
+  def construct():
+    wrapped = mock.mock()
+    return wrapped, DiskCachingFunctionModule(wrapped, str(fixture.cacheFile),
+        [str(fixture.syncerFile)], timedEntriesTTLInS=60,
+        currentTime=lambda: now[0])
+  def exactCall(ret):
+    return mock.call("callExact", ("check", [], options), ret=ret)
+
+  wrapped, module = construct()
+  wrapped.expectCalls(exactCall(["first"]))
+  assert module.callExact("check", [], options) == ["first"]
+  wrapped.checkExpectedCalls()
+
+  now[0] += 59
+  _, module = construct()
+  assert module.callExact("check", [], options) == ["first"]
+
+  now[0] += 1
+  wrapped, module = construct()
+  wrapped.expectCalls(exactCall(["second"]))
+  assert module.callExact("check", [], options) == ["second"]
+  wrapped.checkExpectedCalls()
+
+  loc.join("file").write("")
+  wrapped, module = construct()
+  wrapped.expectCalls(exactCall([]))
+  assert module.callExact("check", [], options) == []
+  wrapped.checkExpectedCalls()
+
+def test_shouldOnlyRefreshCheckResultsIfToldNotToReuseThem(fixture):
+  options = { "DryRun": "1" }
+  def construct(reuse):
+    wrapped = mock.mock()
+    return wrapped, DiskCachingFunctionModule(wrapped, str(fixture.cacheFile),
+        [str(fixture.syncerFile)], reuseTimedEntries=reuse)
+  def exactCall(ret):
+    return mock.call("callExact", ("check", [], options), ret=ret)
+
+  for ret in [["first"], ["second"]]:
+    wrapped, module = construct(False)
+    wrapped.expectCalls(exactCall(ret))
+    assert module.callExact("check", [], options) == ret
+    wrapped.checkExpectedCalls()
+
+  _, module = construct(True)
+  assert module.callExact("check", [], options) == ["second"]
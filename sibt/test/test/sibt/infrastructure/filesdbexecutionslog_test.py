@@ -16,9 +16,12 @@
 
 import pytest
 from sibt.infrastructure.filesdbexecutionslog import FilesDBExecutionsLog
-from test.common.builders import execution, anyUTCDateTime, constantTimeClock
+from test.common.builders import execution, anyUTCDateTime, \
+    constantTimeClock, orderedDateTimes
 from test.common.assertutil import iterToTest, strToTest
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from sibt.domain.execution import Execution, ExecutionResult
+from sibt.domain.logretentionpolicy import LogRetentionPolicy
 from test.common.presetcyclingclock import PresetCyclingClock
 from test.sibt.infrastructure.linebufferedloggertest import \
     LineBufferedLoggerTest
@@ -132,3 +135,82 @@ class Test_FilesDBExecutionsLogTest(LineBufferedLoggerTest):
     iterToTest(fixture.executionsOf("foo")).shouldContainMatching(
         lambda execution: strToTest(execution.output).\
             shouldInclude("exception").but.shouldNotInclude("traceback"))
+
+  def test_shouldFindTheLatestExecutionsWithoutReadingOlderOnes(self, fixture):
+    executions = [execution(endTime=endTime) for endTime in 
+        orderedDateTimes(3)]
+    for finishedExecution in executions:
+      fixture.addFinishedExecution("foo", finishedExecution)
+
+    fixture.tmpdir.join("foo", "1").remove()
+
+    assert fixture.log.latestExecutionsOfRules(["foo", "bar"], 2) == dict(
+        foo=executions[1:], bar=[])
+
+  def test_shouldContinueLogsThatWereWrittenWithoutAnIndex(self, fixture):
+    executions = [execution(), execution(), execution()]
+    fixture.addFinishedExecution("foo", executions[0])
+    fixture.addFinishedExecution("foo", executions[1])
+    fixture.tmpdir.join("foo", "index").remove()
+
+    assert fixture.log.latestExecutionsOfRules(["foo"], 1)["foo"] == \
+        executions[1:2]
+    fixture.addFinishedExecution("foo", executions[2])
+    assert fixture.executionsOf("foo") == executions
+
+  def test_shouldOnlyReadTheOutputOfFinishedExecutionsWhenItIsAccessed(self,
+      fixture):
+    fixture.addFinishedExecution("foo", execution())
+    loggedExecution = fixture.executionsOf("foo")[0]
+
+    loggingFile = fixture.tmpdir.join("foo", "1")
+    loggingFile.write_binary(loggingFile.read_binary().replace(
+      "foobarüã".encode(), "quuxquuxxx".encode()))
+
+    assert loggedExecution.output == "quuxquuxxx"
+
+  def test_shouldRemoveExecutionsThatAreExpiredAccordingToTheRetentionPolicy(
+      self, fixture):
+    executions = [execution(endTime=endTime) for endTime in 
+        orderedDateTimes(4)]
+    for finishedExecution in executions:
+      fixture.addFinishedExecution("foo", finishedExecution)
+
+    fixture.log.removeExpiredExecutions("foo", LogRetentionPolicy(keepLast=1,
+      keepFor=timedelta(days=800)), executions[-1].endTime)
+
+    assert fixture.executionsOf("foo") == executions[2:]
+    assert not fixture.tmpdir.join("foo", "1").exists()
+
+  def test_shouldKeepFailedExecutionsForTheirOwnDuration(self, fixture):
+    failedExecution = Execution(anyUTCDateTime(), "failed", 
+        ExecutionResult(datetime(2000, 1, 1, tzinfo=timezone.utc), False))
+    succeededExecution = execution(
+        endTime=datetime(2000, 1, 2, tzinfo=timezone.utc))
+    fixture.addFinishedExecution("foo", failedExecution)
+    fixture.addFinishedExecution("foo", succeededExecution)
+    fixture.addFinishedExecution("foo", execution())
+
+    fixture.log.removeExpiredExecutions("foo", LogRetentionPolicy(keepLast=1,
+      keepFailedFor=timedelta(days=30)), 
+      datetime(2000, 1, 20, tzinfo=timezone.utc))
+
+    assert fixture.executionsOf("foo")[0] == failedExecution
+    assert len(fixture.executionsOf("foo")) == 2
+
+  def test_shouldCompactExpiredExecutionsIntoArchivesThatCanStillBeRead(self,
+      fixture):
+    executions = [execution(startTime=startTime) for startTime in [
+      datetime(2004, 5, 1, tzinfo=timezone.utc),
+      datetime(2004, 5, 31, tzinfo=timezone.utc),
+      datetime(2004, 6, 1, tzinfo=timezone.utc),
+      anyUTCDateTime()]]
+    for finishedExecution in executions:
+      fixture.addFinishedExecution("foo", finishedExecution)
+
+    fixture.log.removeExpiredExecutions("foo", LogRetentionPolicy(keepLast=1,
+      compact=True), anyUTCDateTime())
+
+    assert set(path.basename for path in fixture.tmpdir.join("foo").listdir()) \
+        == {"index", "4", "2004-05.gz", "2004-06.gz"}
+    assert fixture.executionsOf("foo") == executions
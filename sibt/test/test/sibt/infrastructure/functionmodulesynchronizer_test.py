@@ -42,6 +42,14 @@ class Fixture(object):
 def fixture():
   return Fixture()
 
+def describeCall(ret=None):
+  def throwNotImplementedEx():
+    raise ModuleFunctionNotImplementedException("describe")
+
+  return mock.callMatching("callFuzzy", lambda funcName, *_: 
+      funcName == "describe", ret=ret, 
+      sideEffectFunc=None if ret is not None else throwNotImplementedEx)
+
 def test_shouldCallAppropriateFunctionForSynchronization(fixture):
   options = mkSyncerOpts(One="1", Two="two")
 
@@ -67,7 +75,7 @@ def test_shouldWrapFunctionNotImplementedException(fixture):
 def test_shouldSplitFuzzyOutputForTypeAndNameOfAvailableOptions(fixture):
   ret = ["Default", "b B"]
 
-  fixture.functions.expectCalls(mock.callMatching("callFuzzy",
+  fixture.functions.expectCalls(describeCall(), mock.callMatching("callFuzzy",
     lambda funcName, *_: funcName == "available-options", ret=ret))
 
   assert iterToTest(fixture.syncer.availableOptions).shouldContainMatching(
@@ -122,7 +130,7 @@ def test_shouldEvaluateExactOutputAndCallTheClientWhenListingFiles(fixture):
   path = "some/file"
   expectedOptions = {"Opt": "bar"}
 
-  fixture.functions.expectCalls(mock.callMatching("callExact", 
+  fixture.functions.expectCalls(mock.callMatching("callExactStreaming", 
     lambda funcName, args, options: funcName == "list-files" and list(args) == 
       [path, "2", "93,460", "0"], ret=listing))
 
@@ -136,6 +144,7 @@ def test_shouldTreatFirstLineOfPortOutputAsWrittenToFlag(fixture):
         funcName == "info-of-port" and args[0] == number, ret=ret)
 
   fixture.functions.expectCallsInAnyOrder(
+    describeCall(),
     protocolsCall("1", ["1", "a", "b"]),
     protocolsCall("2", ["1", "c"]),
     protocolsCall("3", ["0", "d", "e", "f"]),
@@ -147,6 +156,39 @@ def test_shouldTreatFirstLineOfPortOutputAsWrittenToFlag(fixture):
       lambda port: port.supportedProtocols == ["d", "e", "f"] and \
           not port.isWrittenTo)
 
+def test_shouldGetOptionsAndPortsFromOneDescribeCallIfItIsImplemented(
+    fixture):
+  fixture.functions.expectCalls(describeCall(ret=[
+    "[options]", 
+    "b B",
+    "[port]",
+    "0",
+    "a",
+    "[port]",
+    "1",
+    "b",
+    "c",
+    "[specials]",
+    "one-must-be-file"]))
+
+  iterToTest(fixture.syncer.availableOptions).shouldContainMatching(
+      lambda opt: opt.name == "B" and opt.optionType == types.Bool)
+  iterToTest(fixture.syncer.ports).shouldContainMatching(
+      lambda port: port.supportedProtocols == ["a"] and not port.isWrittenTo,
+      lambda port: port.supportedProtocols == ["b", "c"] and port.isWrittenTo)
+  assert fixture.syncer.onePortMustHaveFileProtocol
+
+  fixture.functions.checkExpectedCalls()
+
+def test_shouldTreatMissingSectionsOfTheDescriptionAsNotImplemented(fixture):
+  fixture.functions.expectCalls(describeCall(ret=["[specials]"]))
+
+  with pytest.raises(SynchronizerFuncNotImplementedException):
+    _ = fixture.syncer.availableOptions
+  with pytest.raises(SynchronizerFuncNotImplementedException):
+    _ = fixture.syncer.ports
+  assert not fixture.syncer.onePortMustHaveFileProtocol
+
 def test_shouldConvertArgumentsAndOptionsToStringsDependingOnTheirType(fixture):
   enum = types.Enum("A", "B")
   options = {
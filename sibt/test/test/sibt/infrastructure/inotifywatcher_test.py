@@ -0,0 +1,68 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+from sibt.infrastructure.inotifywatcher import InotifyWatcher
+
+class Fixture(object):
+  def __init__(self, tmpdir):
+    self.tmpdir = tmpdir
+
+  def construct(self, *dirs):
+    self.watcher = InotifyWatcher([str(directory) for directory in dirs])
+    return self.watcher
+
+  def changes(self):
+    ret = []
+    for _ in range(20):
+      newChanges = self.watcher.waitForChanges(0.05)
+      if len(newChanges) == 0 and len(ret) > 0:
+        break
+      ret.extend(newChanges)
+    return set(ret)
+
+@pytest.fixture
+def fixture(tmpdir):
+  ret = Fixture(tmpdir)
+  yield ret
+  ret.watcher.close()
+
+def test_shouldReportTheNamesOfChangedFilesInEachDir(fixture):
+  rulesDir = fixture.tmpdir.mkdir("rules")
+  enabledDir = fixture.tmpdir.mkdir("enabled")
+  rulesDir.join("a").write("")
+  watcher = fixture.construct(rulesDir, enabledDir)
+  assert watcher.waitForChanges(0) == []
+
+  rulesDir.join("a").write("[Rule]")
+  enabledDir.join("a").mksymlinkto(rulesDir.join("a"))
+  assert fixture.changes() == { (str(rulesDir), "a"), (str(enabledDir), "a") }
+
+  rulesDir.join("a").remove()
+  assert fixture.changes() == { (str(rulesDir), "a") }
+
+def test_shouldStartWatchingDirsOnceTheyAreCreated(fixture):
+  rulesDir = fixture.tmpdir.join("rules")
+  fixture.construct(rulesDir)
+
+  rulesDir.mkdir()
+  assert fixture.changes() == { (str(rulesDir), None) }
+
+  rulesDir.join("b").write("")
+  assert fixture.changes() == { (str(rulesDir), "b") }
+
+  rulesDir.remove()
+  assert (str(rulesDir), None) in fixture.changes()
@@ -15,7 +15,8 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pytest
-from sibt.infrastructure.location import LocalLocation, RemoteLocation
+from sibt.infrastructure.location import LocalLocation, RemoteLocation, \
+    forgetResolvedPaths
 from sibt.domain.exceptions import LocationInvalidException, \
     LocationNotAbsoluteException
 from test.common.builders import writeFileTree
@@ -144,3 +145,20 @@ class Test_LocalLocationTest(LocationTest):
     self.assertIsNotWithin(inTmpdir("to-repo/to-without/"), inTmpdir("repo"))
     self.assertIsWithin(inTmpdir("to-repo/to-without"), inTmpdir("repo"), 
         relPart="to-without")
+
+  def test_shouldRememberResolvedSymlinksUntilTheyAreExplicitlyForgotten(self,
+      tmpdir):
+    tmpdir.mkdir("a")
+    tmpdir.mkdir("b")
+    link = tmpdir.join("link")
+    link.mksymlinkto(tmpdir.join("a"))
+    container = self.locWithPath(str(link) + "/")
+
+    self.assertIsWithin(str(tmpdir.join("a", "foo")), str(link) + "/")
+    link.remove()
+    link.mksymlinkto(tmpdir.join("b"))
+    assert container.contains(self.locWithPath(str(tmpdir.join("a", "foo"))))
+
+    forgetResolvedPaths()
+    self.assertIsNotWithin(str(tmpdir.join("a", "foo")), str(link) + "/")
+    self.assertIsWithin(str(tmpdir.join("b", "foo")), str(link) + "/")
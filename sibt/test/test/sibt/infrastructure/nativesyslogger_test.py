@@ -0,0 +1,115 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import os
+import re
+import socket
+import time
+from sibt.infrastructure.nativesyslogger import NativeSysLogger, \
+    parseLoggerOptions
+from sibt.infrastructure.exceptions import ExternalFailureException
+from test.common.rfc3164syslogserver import Rfc3164SyslogServer
+from test.common.assertutil import iterToTest
+from test.sibt.infrastructure.linebufferedloggertest import \
+    LineBufferedLoggerTest
+
+TestPort = 6733
+
+def loggerOptions(testPort, *furtherOptions):
+  return " ".join(["--udp --server localhost --port {0} --rfc3164".format(
+    testPort)] + list(furtherOptions))
+
+class Fixture(object):
+  def __init__(self, tmpdir):
+    self.tmpdir = tmpdir
+
+  def make(self, port=None, furtherOptions=[], **kwargs):
+    return NativeSysLogger(loggerOptions(port or TestPort, *furtherOptions),
+        **kwargs)
+
+  def testServer(self):
+    return Rfc3164SyslogServer(TestPort)
+
+  def callWithLoggerAndClose(self, func):
+    self.linesRead = 0
+    with self.testServer() as self.lineBufferedTestServer:
+      logger = self.make()
+      func(logger)
+      logger.close()
+
+  def readLines(self):
+    packets = self.lineBufferedTestServer.packets
+    for _ in range(100):
+      if len(packets) > self.linesRead:
+        break
+      time.sleep(0.01)
+    self.linesRead = len(packets)
+    return [packet.message.decode() for packet in packets]
+
+@pytest.fixture
+def fixture(tmpdir):
+  return Fixture(tmpdir)
+
+class Test_NativeSysLoggerTest(LineBufferedLoggerTest):
+  def test_shouldSendEachLineAsAPacketWithFacilitySeverityAndTag(self,
+      fixture):
+    logger = fixture.make(prefix=b"prefix", facility="mail",
+        severity="warning", tag="beer")
+
+    with fixture.testServer() as server:
+      logger.write(b"foo\nbar\n")
+      logger.write(b"\n", severity="err")
+      logger.close()
+
+    iterToTest(server.packets).shouldContainMatching(
+        lambda packet: packet.message == b"prefix: foo" and
+          packet.facility == "mail" and packet.severity == "warning" and
+          packet.tag == b"beer",
+        lambda packet: packet.message == b"prefix: bar",
+        lambda packet: packet.message == b"prefix: " and
+          packet.severity == "err")
+
+  def test_shouldWriteToLocalUnixSocketsWithoutAHostName(self, fixture):
+    socketPath = str(fixture.tmpdir.join("log"))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+      server.bind(socketPath)
+
+      logger = NativeSysLogger("--socket " + socketPath, tag="sibt")
+      logger.write(b"foo\n")
+      logger.close()
+
+      assert re.match(rb"^<14>[A-Z][a-z]{2} [ 0-9]\d \d\d:\d\d:\d\d "
+          rb"sibt\[" + str(os.getpid()).encode() + rb"\]: foo$",
+          server.recv(1024))
+
+  def test_shouldFallBackToTheLoggerProgramForUnsupportedOptions(self,
+      fixture):
+    assert parseLoggerOptions("--udp --size 300") is None
+    logger = fixture.make(furtherOptions=["--size", "300"])
+
+    with fixture.testServer() as server:
+      logger.write(b"foo\n")
+
+    iterToTest(server.packets).shouldContainMatching(
+        lambda packet: packet.message == b"foo")
+
+  def test_shouldThrowAnExceptionIfNeitherItNorTheFallbackCanLog(self,
+      fixture):
+    logger = fixture.make(port=-1)
+
+    with pytest.raises(ExternalFailureException):
+      logger.write(b"\n")
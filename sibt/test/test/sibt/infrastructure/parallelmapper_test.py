@@ -16,6 +16,8 @@
 
 import pytest
 from sibt.infrastructure.parallelmapper import ParallelMapper
+import threading
+import time
 
 def test_shouldReturnMappedResultsAsAnIterable():
   mapper = ParallelMapper()
@@ -42,3 +44,64 @@ def test_shouldThrowOccurredExceptionsWhenTheResultIsRetrieved():
   with pytest.raises(Exception) as ex:
     next(result)
   assert str(ex.value) == "b"
+
+def test_shouldLetRunningFunctionsFinishBeforeThrowingAnException():
+  finished = []
+  def mapFunc(x):
+    if x == 1:
+      time.sleep(0.01)
+      raise Exception("a")
+    time.sleep(0.2)
+    finished.append(x)
+
+  mapper = ParallelMapper(3)
+  result = iter(mapper.map(mapFunc, [1, 2, 3]))
+  with pytest.raises(Exception):
+    next(result)
+  assert sorted(finished) == [2, 3]
+
+def test_shouldNotStartFunctionsThatAreStillPendingAfterAnException():
+  started = []
+  def mapFunc(x):
+    started.append(x)
+    if x == 1:
+      raise Exception("a")
+    time.sleep(0.1)
+
+  mapper = ParallelMapper(1)
+  result = iter(mapper.map(mapFunc, [2, 1] + list(range(3, 20))))
+  next(result)
+  with pytest.raises(Exception):
+    next(result)
+  assert len(started) < 19
+
+def test_shouldNeverRunMoreThanTheGivenNumberOfFunctionsAtOnce():
+  lock = threading.Lock()
+  running = [0]
+  maxRunning = [0]
+  def mapFunc(x):
+    with lock:
+      running[0] += 1
+      maxRunning[0] = max(maxRunning[0], running[0])
+    time.sleep(0.01)
+    with lock:
+      running[0] -= 1
+    return x
+
+  mapper = ParallelMapper(2)
+  assert list(mapper.map(mapFunc, range(10))) == list(range(10))
+  assert maxRunning[0] == 2
+
+def test_shouldYieldEachResultAsSoonAsItAndAllPreviousOnesAreAvailable():
+  lastMayFinish = threading.Event()
+  def mapFunc(x):
+    if x == 3:
+      assert lastMayFinish.wait(5)
+    return x
+
+  mapper = ParallelMapper()
+  result = mapper.map(mapFunc, [1, 2, 3])
+  assert next(result) == 1
+  assert next(result) == 2
+  lastMayFinish.set()
+  assert next(result) == 3
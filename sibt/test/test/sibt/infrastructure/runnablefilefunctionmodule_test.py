@@ -80,3 +80,54 @@ def test_shouldThrowNotImplementedExceptionIffExecutableReturns200(fixture):
   checkExceptionTypeWithExitStatus(ModuleFunctionNotImplementedException, 200)
   fixture.execs.reset()
   checkExceptionTypeWithExitStatus(ExternalFailureException, 1)
+
+class _FakeServer(object):
+  def __init__(self, output, exitStatus=0):
+    self.output = output
+    self.exitStatus = exitStatus
+    self.alive = True
+    self.calls = []
+
+  def getOutput(self, *arguments, delimiter="\n"):
+    self.calls.append((arguments, delimiter))
+    if self.exitStatus != 0:
+      raise ExternalFailureException("", [], self.exitStatus)
+    return self.output
+
+  def close(self):
+    self.alive = False
+
+def test_shouldSendOutputCallsToAWarmServerAndStartItOnlyOnce(fixture):
+  server = _FakeServer(["a ", "", "b"])
+  startedServers = []
+  def startServer(program):
+    startedServers.append(program)
+    return server
+  fixture.execs.startServer = startServer
+
+  assert fixture.functions.callFuzzy("info-of-port", ["1"], {}) == ["a", "b"]
+  assert fixture.functions.callExact("check", [], {"A": "1"}) == \
+      ["a ", "", "b"]
+
+  assert startedServers == [fixture.executablePath]
+  assert server.calls == [
+      (("info-of-port", "1"), "\n"),
+      (("check", "A=1"), "\0")]
+
+def test_shouldStillSignalNotImplementedFunctionsWhenUsingAServer(fixture):
+  fixture.execs.startServer = lambda _: _FakeServer([], exitStatus=200)
+
+  with pytest.raises(ModuleFunctionNotImplementedException):
+    fixture.functions.callFuzzy("available-options", [], {})
+
+def test_shouldFallBackToForkingIfNoServerCanBeStarted(fixture):
+  fixture.execs.startServer = lambda _: None
+  fixture.execs.expect(fixture.executablePath, 
+      execmock.call(("available-options",), ret=["Opt"]),
+      execmock.call(("list-files", "foo"), ret=["file"], delimiter="\0"))
+
+  assert fixture.functions.callFuzzy("available-options", [], {}) == ["Opt"]
+  assert list(fixture.functions.callExactStreaming("list-files", ["foo"], 
+    {})) == ["file"]
+
+  fixture.execs.check()
@@ -0,0 +1,34 @@
+# This file is part of sibt (simple backup tool), a program that integrates existing backup tools.
+# Copyright 2018 Patrick Plagwitz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta, timezone
+from sibt.infrastructure.timehelper import nextTimeWithInterval, \
+    timeAfterInterval, toUTC
+
+def test_shouldAddIntervalsOfADayOrMoreToTheStartOfTheLocalDay():
+  lastTime = toUTC(datetime(2018, 3, 4, 15, 30))
+  assert timeAfterInterval(lastTime, timedelta(days=2)) == \
+      toUTC(datetime(2018, 3, 6))
+  assert timeAfterInterval(lastTime, timedelta(hours=5)) == \
+      toUTC(datetime(2018, 3, 4, 20, 30))
+
+def test_shouldNeverReturnATimeBeforeNowForTheNextExecution():
+  now = datetime(2018, 3, 10, 12, tzinfo=timezone.utc)
+  assert nextTimeWithInterval(None, timedelta(days=1), now) == now
+  assert nextTimeWithInterval(now - timedelta(days=5), timedelta(days=1),
+      now) == now
+  assert nextTimeWithInterval(now - timedelta(hours=1), timedelta(hours=2),
+      now) == now + timedelta(hours=1)